@@ -0,0 +1,161 @@
+import numpy as np
+import pandas as pd
+
+from vhi_ingest import column_types
+from vhi_tensor import VhiTensor
+
+# Аномалії VHI відносно багаторічної норми.
+# Дані зберігаються щільним масивом (область x рік x тиждень). Норма для кожного
+# тижня року рахується з накопичених сум, сум квадратів і кількостей по роках,
+# а ковзні середні - через кумулятивні суми вздовж часу, одразу для всіх областей.
+# Суми оновлюються лише новими або зміненими тижнями.
+
+default_windows = [4, 8, 13]
+
+def rolling_means(series, window, min_periods=None):
+    """Ковзне середнє за window останніх тижнів для кожного рядка масиву (область x час).
+
+    NaN пропускаються; якщо у вікні менше min_periods значень, результат - NaN.
+    """
+    min_periods = window if min_periods is None else min_periods
+    present = ~np.isnan(series)
+    pad = np.zeros((series.shape[0], 1))
+    sums = np.concatenate([pad, np.cumsum(np.where(present, series, 0.0), axis=1, dtype=np.float64)], axis=1)
+    counts = np.concatenate([pad, np.cumsum(present, axis=1)], axis=1)
+    # Сума вікна [t - window + 1, t] - це різниця кумулятивних сум
+    lag = np.maximum(np.arange(1, series.shape[1] + 1) - window, 0)
+    window_sums = sums[:, 1:] - sums[:, lag]
+    window_counts = counts[:, 1:] - counts[:, lag]
+    with np.errstate(invalid='ignore', divide='ignore'):
+        return np.where(window_counts >= min_periods, window_sums / window_counts, np.nan)
+
+class AnomalyModel:
+    """Норма по тижнях року, z-оцінки та ковзні середні індексу для всіх областей."""
+
+    def __init__(self, df, column="VHI", windows=default_windows):
+        self.column = column
+        self.windows = list(windows)
+        self.tensor = VhiTensor.from_frame(df, [column])
+        # Від'ємні значення (-1 у файлах NOAA) означають відсутність даних
+        values = self.values
+        values[values < 0] = np.nan
+        self._accumulate()
+        self.rolling = {window: self._rolling(window, 0) for window in self.windows}
+
+    @property
+    def values(self):
+        return self.tensor.values[self.column]
+
+    def _accumulate(self):
+        present = ~np.isnan(self.values)
+        filled = np.where(present, self.values, 0.0).astype(np.float64)
+        self.sums = filled.sum(axis=1)
+        self.squares = (filled ** 2).sum(axis=1)
+        self.counts = present.sum(axis=1)
+
+    def climatology(self):
+        """Середнє та стандартне відхилення для кожної області і тижня року (область x тиждень)."""
+        with np.errstate(invalid='ignore', divide='ignore'):
+            mean = self.sums / self.counts
+            variance = (self.squares - self.sums * mean) / (self.counts - 1)
+        return mean, np.sqrt(np.maximum(variance, 0))
+
+    def anomalies(self):
+        """Відхилення від норми і z-оцінки (область x рік x тиждень)."""
+        mean, std = self.climatology()
+        deviation = self.values - mean[:, None, :]
+        with np.errstate(invalid='ignore', divide='ignore'):
+            zscores = np.where(std[:, None, :] > 0, deviation / std[:, None, :], np.nan)
+        return deviation, zscores
+
+    def _rolling(self, window, start):
+        """Ковзні середні від позиції часу start до кінця (область x час)."""
+        series = self.values.reshape(self.values.shape[0], -1)
+        begin = max(start - window + 1, 0)
+        return rolling_means(series[:, begin:], window)[:, start - begin:]
+
+    def update(self, df):
+        """Додає нові або змінені тижні; норма і ковзні середні оновлюються лише ними.
+
+        Повертає таблицю аномалій для рядків df.
+        """
+        self._extend(df)
+        regions = np.searchsorted(self.tensor.regions, df["Region_ID"].to_numpy())
+        years = df["Year"].to_numpy().astype(np.int64) - self.tensor.years[0]
+        weeks = df["Week"].to_numpy().astype(np.int64) - 1
+        new = df[self.column].to_numpy(dtype=np.float32)
+        new = np.where(new < 0, np.nan, new)
+
+        # Внесок старих значень віднімається, нових - додається
+        old = self.values[regions, years, weeks]
+        for values, sign in ((old, -1), (new, 1)):
+            present = ~np.isnan(values)
+            filled = np.where(present, values, 0.0).astype(np.float64)
+            np.add.at(self.sums, (regions, weeks), sign * filled)
+            np.add.at(self.squares, (regions, weeks), sign * filled ** 2)
+            np.add.at(self.counts, (regions, weeks), sign * present)
+        self.values[regions, years, weeks] = new
+
+        # Ковзні середні перераховуються від найранішого зміненого тижня
+        start = int((years * self.values.shape[2] + weeks).min()) if len(df) else self.values[0].size
+        for window in self.windows:
+            self.rolling[window][:, start:] = self._rolling(window, start)
+        return self.to_frame(df["Region_ID"].to_numpy(), df["Year"].to_numpy(), df["Week"].to_numpy())
+
+    def _extend(self, df):
+        """Розширює масиви, якщо з'явились нові роки (нові області не очікуються)."""
+        last_year = int(df["Year"].max()) if len(df) else 0
+        extra = last_year - int(self.tensor.years[-1])
+        if extra <= 0:
+            return
+        regions, _, weeks = self.values.shape
+        padding = np.full((regions, extra, weeks), np.nan, dtype=np.float32)
+        self.tensor.values[self.column] = np.concatenate([self.values, padding], axis=1)
+        self.tensor.years = np.arange(self.tensor.years[0], last_year + 1)
+        for window in self.windows:
+            self.rolling[window] = np.concatenate(
+                [self.rolling[window], np.full((regions, extra * weeks), np.nan)], axis=1)
+
+    def to_frame(self, region_ids=None, years=None, weeks=None):
+        """Таблиця значень, норми, аномалій і ковзних середніх.
+
+        Без аргументів повертаються всі тижні з даними; інакше - вказані
+        (область, рік, тиждень).
+        """
+        if region_ids is None:
+            r, y, w = np.nonzero(~np.isnan(self.values))
+        else:
+            r = np.searchsorted(self.tensor.regions, np.asarray(region_ids))
+            y = np.asarray(years, dtype=np.int64) - self.tensor.years[0]
+            w = np.asarray(weeks, dtype=np.int64) - 1
+        t = y * self.values.shape[2] + w
+
+        mean, std = self.climatology()
+        values = self.values[r, y, w]
+        deviation = values - mean[r, w]
+        with np.errstate(invalid='ignore', divide='ignore'):
+            zscores = np.where(std[r, w] > 0, deviation / std[r, w], np.nan)
+        frame = pd.DataFrame({
+            "Region_ID": self.tensor.regions[r].astype(column_types["Region_ID"]),
+            "Year": self.tensor.years[y].astype(column_types["Year"]),
+            "Week": self.tensor.weeks[w].astype(column_types["Week"]),
+            self.column: values,
+            "norm_mean": mean[r, w],
+            "norm_std": std[r, w],
+            "anomaly": deviation,
+            "zscore": zscores,
+        })
+        for window in self.windows:
+            frame[f"rolling_{window}"] = self.rolling[window][r, t]
+        return frame
+
+    def region_frame(self, region_id, start_year=None, end_year=None):
+        """Таблиця аномалій однієї області за інтервал років (тижні з даними)."""
+        years = self.tensor.years
+        region = self.tensor.region_position(region_id)
+        part = self.tensor.year_slice(years[0] if start_year is None else start_year,
+                                      years[-1] if end_year is None else end_year)
+        if len(region) == 0:
+            return self.to_frame([], [], [])
+        y, w = np.nonzero(~np.isnan(self.values[region[0], part]))
+        return self.to_frame(np.full(len(y), region_id), years[part][y], w + 1)
@@ -0,0 +1,161 @@
+import os
+import json
+import time
+import random
+import hashlib
+import argparse
+import urllib.error
+import urllib.request
+from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+# Паралельне завантаження даних VHI з NOAA.
+# Кожна область зберігається у файлі vhi_{id}.csv, а в маніфесті запам'ятовуються
+# ETag, Last-Modified і SHA-256 вмісту. Повторний запуск надсилає умовний запит
+# і не перезаписує файли областей, дані яких не змінились.
+
+base_url = "https://www.star.nesdis.noaa.gov/smcd/emb/vci/VH/get_TS_admin.php"
+region_ids = range(1, 28)
+manifest_name = 'download_manifest.json'
+
+# Налаштування за замовчуванням
+default_workers = 6
+default_retries = 4
+default_backoff = 0.5
+default_timeout = 30
+
+# Помилки сервера, після яких запит варто повторити
+retry_statuses = {429, 500, 502, 503, 504}
+
+def region_url(region_id, year1=1981, year2=2024, url=base_url):
+    """Адреса CSV з даними VHI для області."""
+    return f"{url}?country=UKR&provinceID={region_id}&year1={year1}&year2={year2}&type=Mean"
+
+def region_file(data_dir, region_id):
+    """Шлях до файлу області (одне постійне ім'я замість нового файлу на кожен запуск)."""
+    return os.path.join(data_dir, f"vhi_{region_id}.csv")
+
+def read_manifest(data_dir):
+    """Читає маніфест завантажень (порожній словник, якщо його немає)."""
+    path = os.path.join(data_dir, manifest_name)
+    if not os.path.exists(path):
+        return {}
+    with open(path, encoding='utf-8') as file:
+        return json.load(file)
+
+def write_manifest(data_dir, manifest):
+    """Записує маніфест через тимчасовий файл, щоб він не залишився пошкодженим."""
+    path = os.path.join(data_dir, manifest_name)
+    temp_path = path + '.tmp'
+    with open(temp_path, 'w', encoding='utf-8') as file:
+        json.dump(manifest, file, indent=2, ensure_ascii=False)
+    os.replace(temp_path, path)
+
+def _write_atomic(path, content):
+    temp_path = path + '.part'
+    with open(temp_path, 'wb') as file:
+        file.write(content)
+    os.replace(temp_path, path)
+
+def fetch(url, headers=None, retries=default_retries, backoff=default_backoff, timeout=default_timeout):
+    """Виконує GET-запит з повторами та експоненційною затримкою.
+
+    Повертає (статус, заголовки, вміст); для відповіді 304 вміст порожній.
+    Повторюються лише мережеві помилки та тимчасові помилки сервера.
+    """
+    request = urllib.request.Request(url, headers=headers or {})
+    for attempt in range(retries + 1):
+        try:
+            with urllib.request.urlopen(request, timeout=timeout) as response:
+                return response.status, dict(response.headers), response.read()
+        except urllib.error.HTTPError as e:
+            if e.code == 304:
+                return 304, dict(e.headers), b''
+            if e.code not in retry_statuses or attempt == retries:
+                raise
+        except (urllib.error.URLError, TimeoutError, ConnectionError):
+            if attempt == retries:
+                raise
+        # Затримка подвоюється з кожною спробою; випадкова частина розводить потоки в часі
+        time.sleep(backoff * 2 ** attempt * (1 + random.random()))
+
+def download_region(region_id, data_dir, previous=None, url=base_url, **options):
+    """Завантажує дані однієї області, якщо вони змінились з попереднього разу.
+
+    previous - запис маніфесту для області з попереднього запуску.
+    Повертає новий запис маніфесту з полем status.
+    """
+    previous = previous or {}
+    output_file = region_file(data_dir, region_id)
+    headers = {}
+    if os.path.exists(output_file):
+        if previous.get('etag'):
+            headers['If-None-Match'] = previous['etag']
+        if previous.get('last_modified'):
+            headers['If-Modified-Since'] = previous['last_modified']
+
+    started = time.perf_counter()
+    status, response_headers, content = fetch(region_url(region_id, url=url), headers, **options)
+    entry = dict(previous, region_id=region_id, file=os.path.basename(output_file))
+    entry['seconds'] = round(time.perf_counter() - started, 3)
+
+    if status == 304:
+        entry['status'] = 'not_modified'
+        return entry
+
+    # Сервер може не підтримувати умовні запити - тоді порівнюється хеш вмісту
+    digest = hashlib.sha256(content).hexdigest()
+    entry['etag'] = response_headers.get('ETag')
+    entry['last_modified'] = response_headers.get('Last-Modified')
+    if digest == previous.get('sha256') and os.path.exists(output_file):
+        entry['status'] = 'unchanged'
+        return entry
+
+    _write_atomic(output_file, content)
+    entry.update(status='downloaded', sha256=digest, size=len(content),
+                 downloaded=datetime.now().isoformat(timespec='seconds'))
+    return entry
+
+def download_all(data_dir="data", regions=region_ids, workers=default_workers, url=base_url, verbose=True, **options):
+    """Завантажує дані областей паралельно у workers потоків.
+
+    url можна замінити адресою локального HTTP-сервера для перевірки без мережі.
+    Повертає словник {id області: запис маніфесту}.
+    """
+    os.makedirs(data_dir, exist_ok=True)
+    manifest = read_manifest(data_dir)
+    results = {}
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = {executor.submit(download_region, region_id, data_dir, manifest.get(str(region_id)), url, **options):
+                   region_id for region_id in regions}
+        for future in as_completed(futures):
+            region_id = futures[future]
+            try:
+                entry = future.result()
+                manifest[str(region_id)] = {key: value for key, value in entry.items() if key != 'status'}
+            except Exception as e:
+                entry = {'region_id': region_id, 'status': 'error', 'error': str(e)}
+            results[region_id] = entry
+            if verbose:
+                print(f"Область {region_id}: {entry['status']}" + (f" ({entry['error']})" if 'error' in entry else ''))
+
+    write_manifest(data_dir, manifest)
+    return dict(sorted(results.items()))
+
+def main():
+    parser = argparse.ArgumentParser(description="Паралельне завантаження даних VHI з NOAA")
+    parser.add_argument('--data-dir', default='data', help="папка для CSV-файлів")
+    parser.add_argument('--workers', type=int, default=default_workers, help="кількість одночасних запитів")
+    parser.add_argument('--retries', type=int, default=default_retries, help="кількість повторів запиту")
+    parser.add_argument('--url', default=base_url, help="адреса сервера (наприклад, локального)")
+    args = parser.parse_args()
+
+    results = download_all(args.data_dir, workers=args.workers, url=args.url, retries=args.retries)
+    counts = {}
+    for entry in results.values():
+        counts[entry['status']] = counts.get(entry['status'], 0) + 1
+    print(counts)
+
+if __name__ == "__main__":
+    main()
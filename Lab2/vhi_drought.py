@@ -0,0 +1,118 @@
+import numpy as np
+import pandas as pd
+
+# Аналіз посух за даними VHI.
+# Один раз будується щільна матриця мінімального VHI (рік x область); після цього
+# будь-яка кількість порогів і часток уражених областей перевіряється одним
+# векторизованим порівнянням з матрицею, без повторних проходів по рядках.
+
+class DroughtEngine:
+    """Матриця мінімального VHI за рік для кожної області та запити до неї.
+
+    Від'ємні значення VHI (-1 у файлах NOAA позначає відсутні дані) не
+    вважаються вимірюваннями і не враховуються.
+    """
+
+    def __init__(self, df):
+        years = df["Year"].to_numpy().astype(np.int64)
+        region_ids = df["Region_ID"].to_numpy()
+        vhi = df["VHI"].to_numpy(dtype=np.float32)
+        valid = vhi >= 0
+
+        self.regions = np.unique(region_ids)
+        self.years = np.arange(years.min(), years.max() + 1) if len(years) else np.empty(0, dtype=np.int64)
+        # Кількість областей у даних (як nunique у початковій версії)
+        self.province_count = len(self.regions)
+
+        # Рядки впорядковуються за (рік, область); мінімуми клітинок рахуються через reduceat
+        cells = (years - (self.years[0] if len(years) else 0)) * len(self.regions) + np.searchsorted(self.regions, region_ids)
+        self.order = np.argsort(cells, kind='stable')
+        self.cells = cells[self.order]
+        self.vhi = np.where(valid, vhi, np.nan)[self.order]
+        self.year_ids = df["Year"].to_numpy()[self.order]
+        self.region_ids = region_ids[self.order]
+        self.labels = df.index.to_numpy()[self.order]
+
+        self.matrix = np.full(len(self.years) * len(self.regions), np.nan, dtype=np.float32)
+        measured = ~np.isnan(self.vhi)
+        if measured.any():
+            cells_measured, values = self.cells[measured], self.vhi[measured]
+            starts = np.concatenate([[0], np.flatnonzero(np.diff(cells_measured)) + 1])
+            self.matrix[cells_measured[starts]] = np.minimum.reduceat(values, starts)
+        self.matrix = self.matrix.reshape(len(self.years), len(self.regions))
+
+        # Позиції першого рядка кожного року у впорядкованих даних
+        self.year_offsets = np.searchsorted(self.year_ids, np.append(self.years, self.years[-1] + 1 if len(self.years) else 0))
+
+    def affected_counts(self, thresholds):
+        """Кількість областей з мінімальним VHI нижче порогу: масив (порогів x років)."""
+        thresholds = np.atleast_1d(np.asarray(thresholds, dtype=np.float32))
+        # NaN < поріг дає False, тому роки без даних не вважаються посушливими
+        with np.errstate(invalid='ignore'):
+            return (self.matrix[None, :, :] < thresholds[:, None, None]).sum(axis=2)
+
+    def min_affected(self, affected_percentages):
+        """Мінімальна кількість уражених областей для кожної частки."""
+        return (self.province_count * np.atleast_1d(np.asarray(affected_percentages, dtype=np.float64))).astype(np.int64)
+
+    def sweep(self, thresholds, affected_percentages):
+        """Роки з посухою для всіх комбінацій порогу і частки одним проходом.
+
+        Повертає булевий масив (часток x порогів x років).
+        """
+        counts = self.affected_counts(thresholds)
+        return counts[None, :, :] >= self.min_affected(affected_percentages)[:, None, None]
+
+    def sweep_table(self, thresholds, affected_percentages):
+        """Результат sweep у вигляді таблиці: поріг, частка, кількість посушливих років і їх список."""
+        result = self.sweep(thresholds, affected_percentages)
+        thresholds = np.atleast_1d(thresholds)
+        affected_percentages = np.atleast_1d(affected_percentages)
+        rows = []
+        for p, percentage in enumerate(affected_percentages):
+            for t, threshold in enumerate(thresholds):
+                years = self.years[result[p, t]]
+                rows.append({'threshold': threshold, 'affected_percentage': percentage,
+                             'drought_years': len(years), 'years': years.tolist()})
+        return pd.DataFrame(rows)
+
+    def drought_years(self, threshold=15, affected_percentage=0.2):
+        """Роки, коли посуха торкнулася не менше вказаної частки областей."""
+        return self.years[self.sweep([threshold], [affected_percentage])[0, 0]]
+
+    def drought_rows(self, threshold=15, affected_percentage=0.2):
+        """Рядки (Year, Region_ID, VHI) з VHI нижче порогу в посушливі роки.
+
+        Рядки вибираються зрізами за роками, без повторного перегляду всіх даних.
+        """
+        positions = (self.drought_years(threshold, affected_percentage) - self.years[0]).astype(np.int64)
+        parts = [np.arange(self.year_offsets[i], self.year_offsets[i + 1]) for i in positions]
+        rows = np.concatenate(parts) if parts else np.empty(0, dtype=np.int64)
+        with np.errstate(invalid='ignore'):
+            rows = rows[self.vhi[rows] < threshold]
+        rows = rows[np.argsort(self.order[rows], kind='stable')]
+        return pd.DataFrame({"Year": self.year_ids[rows], "Region_ID": self.region_ids[rows], "VHI": self.vhi[rows]},
+                            index=self.labels[rows])
+
+    def streaks(self, threshold=15, min_length=2):
+        """Серії поспіль посушливих років для кожної області.
+
+        Рік посушливий для області, якщо її мінімальний VHI нижче порогу.
+        Повертає DataFrame: Region_ID, start_year, end_year, length.
+        """
+        with np.errstate(invalid='ignore'):
+            dry = self.matrix < threshold
+        # Початки і кінці серій - це переходи False->True і True->False вздовж років
+        padded = np.zeros((len(self.years) + 2, len(self.regions)), dtype=np.int8)
+        padded[1:-1] = dry
+        changes = np.diff(padded, axis=0)
+        start_region, start_year = np.nonzero(changes.T == 1)
+        _, end_year = np.nonzero(changes.T == -1)
+        lengths = end_year - start_year
+        keep = lengths >= min_length
+        return pd.DataFrame({
+            "Region_ID": self.regions[start_region[keep]],
+            "start_year": self.years[start_year[keep]],
+            "end_year": self.years[end_year[keep] - 1],
+            "length": lengths[keep],
+        })
@@ -0,0 +1,74 @@
+import numpy as np
+
+# Індекс даних VHI за (областю, роком, тижнем).
+# Дані впорядковуються за Region_ID, Year, Week, і для кожної клітинки
+# (область, рік, тиждень) зберігається позиція її першого рядка. Вибірка області
+# за інтервалом років і тижнів - це набір суцільних зрізів без перегляду всіх рядків.
+
+sort_columns = ["Region_ID", "Year", "Week"]
+
+def sort_frame(df):
+    """Впорядковує дані за областю, роком і тижнем (якщо вони ще не впорядковані)."""
+    keys = df[sort_columns].to_numpy(dtype=np.int64)
+    flat = (keys[:, 0] * 10000 + keys[:, 1]) * 100 + keys[:, 2]
+    if len(flat) > 1 and np.any(flat[1:] < flat[:-1]):
+        df = df.iloc[np.argsort(flat, kind='stable')]
+    return df.reset_index(drop=True)
+
+def _concat_ranges(starts, stops):
+    """Номери рядків з усіх діапазонів [start, stop) одним масивом."""
+    lengths = stops - starts
+    return np.repeat(starts - np.cumsum(lengths) + lengths, lengths) + np.arange(lengths.sum())
+
+class RegionYearWeekIndex:
+    """Таблиця зсувів для даних, впорядкованих функцією sort_frame."""
+
+    def __init__(self, df):
+        region_ids = df["Region_ID"].to_numpy()
+        years = df["Year"].to_numpy().astype(np.int64)
+        weeks = df["Week"].to_numpy().astype(np.int64)
+        self.regions = np.unique(region_ids)
+        self.years = np.arange(years.min(), years.max() + 1) if len(years) else np.empty(0, dtype=np.int64)
+        self.weeks = (int(weeks.min()), int(weeks.max())) if len(weeks) else (1, 1)
+        self.shape = (len(self.regions), len(self.years), self.weeks[1] - self.weeks[0] + 1)
+
+        # Номер клітинки кожного рядка зростає разом з порядком рядків
+        cells = np.ravel_multi_index((np.searchsorted(self.regions, region_ids),
+                                      years - (self.years[0] if len(years) else 0),
+                                      weeks - self.weeks[0]), self.shape)
+        self.offsets = np.searchsorted(cells, np.arange(int(np.prod(self.shape)) + 1))
+
+    def _cell(self, region, year, week):
+        r = int(np.searchsorted(self.regions, region))
+        return (r * self.shape[1] + (year - int(self.years[0]))) * self.shape[2] + (week - self.weeks[0])
+
+    def _bounds(self, years_range=None, weeks_range=None):
+        year_from, year_to = years_range or (self.years[0], self.years[-1])
+        week_from, week_to = weeks_range or self.weeks
+        # Межі обмежуються наявними роками і тижнями
+        year_from, year_to = max(int(year_from), int(self.years[0])), min(int(year_to), int(self.years[-1]))
+        week_from, week_to = max(int(week_from), self.weeks[0]), min(int(week_to), self.weeks[1])
+        return year_from, year_to, week_from, week_to
+
+    def rows(self, region, years_range=None, weeks_range=None):
+        """Номери рядків області за інтервали років і тижнів (включно).
+
+        Якщо вибрано всі тижні, повертається один зріз, інакше - масив індексів.
+        """
+        if region not in self.regions or len(self.years) == 0:
+            return slice(0, 0)
+        year_from, year_to, week_from, week_to = self._bounds(years_range, weeks_range)
+        if year_from > year_to or week_from > week_to:
+            return slice(0, 0)
+        if (week_from, week_to) == self.weeks:
+            start = self.offsets[self._cell(region, year_from, week_from)]
+            stop = self.offsets[self._cell(region, year_to, week_to) + 1]
+            return slice(int(start), int(stop))
+
+        first = self._cell(region, year_from, week_from)
+        starts = first + np.arange(year_to - year_from + 1) * self.shape[2]
+        return _concat_ranges(self.offsets[starts], self.offsets[starts + (week_to - week_from) + 1])
+
+    def select(self, df, region, years_range=None, weeks_range=None):
+        """Рядки DataFrame (впорядкованого sort_frame) для області за роки і тижні."""
+        return df.iloc[self.rows(region, years_range, weeks_range)]
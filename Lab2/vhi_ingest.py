@@ -0,0 +1,77 @@
+import io
+import re
+import time
+import numpy as np
+import pandas as pd
+from concurrent.futures import ThreadPoolExecutor
+
+# Читання CSV-файлів VHI з NOAA.
+# Файли читаються паралельно в пулі потоків (розбір у pandas звільняє GIL),
+# а стовпці одразу отримують компактні типи.
+
+csv_columns = ["Year", "Week", "SMN", "SMT", "VCI", "TCI", "VHI", "empty"]
+index_columns = ["SMN", "SMT", "VCI", "TCI", "VHI"]
+
+# Компактні типи стовпців результату
+column_types = {
+    "Year": np.int16,
+    "Week": np.int16,
+    **{name: np.float32 for name in index_columns},
+    "Region_ID": np.uint8,
+}
+
+# HTML-розмітка, якою NOAA обгортає CSV
+markup_tags = [b'<tt>', b'</tt>', b'<pre>', b'</pre>', b'<br>']
+
+default_workers = 8
+
+def region_from_name(file_name):
+    """ID області з імені файлу vhi_{id}.csv або vhi_{id}_{час}.csv (або None)."""
+    match = re.search(r'vhi_(\d+)', file_name)
+    return int(match.group(1)) if match else None
+
+def strip_markup(content):
+    """Видаляє HTML-розмітку NOAA і рядки заголовка з байтів файлу.
+
+    Теги <tt><pre>, </pre></tt> і <br> видаляються через bytes.replace,
+    а дані починаються після рядка заголовка "year,week,...".
+    """
+    for tag in markup_tags:
+        content = content.replace(tag, b'')
+    header = re.search(rb'^\s*year\s*,\s*week[^\n]*\n', content, re.IGNORECASE | re.MULTILINE)
+    if header:
+        return content[header.end():]
+    # Формат без рядка заголовка: як і раніше, пропускаються два перші рядки
+    return content.split(b'\n', 2)[-1]
+
+def parse_vhi_bytes(content, region_id):
+    """Розбирає вміст файлу NOAA одразу в стовпці потрібних типів."""
+    df = pd.read_csv(io.BytesIO(strip_markup(content)), names=csv_columns, usecols=csv_columns[:-1],
+                     index_col=False, skipinitialspace=True, dtype=column_types)
+    # Рядки без VHI (неповні рядки в кінці файлу) не потрібні
+    df = df[df["VHI"].notna().to_numpy()]
+    df["Region_ID"] = np.uint8(region_id)
+    return df.reset_index(drop=True)
+
+def read_vhi_file(path, region_id):
+    """Читає один файл NOAA і повертає DataFrame з компактними типами."""
+    with open(path, 'rb') as file:
+        return parse_vhi_bytes(file.read(), region_id)
+
+def _timed_read(path, region_id):
+    started = time.perf_counter()
+    try:
+        return read_vhi_file(path, region_id), time.perf_counter() - started, None
+    except Exception as e:
+        return None, time.perf_counter() - started, e
+
+def read_files(files, workers=default_workers):
+    """Читає файли [(шлях, ID області), ...] паралельно.
+
+    Повертає список (DataFrame або None, час читання в секундах, помилка або None)
+    у порядку вхідного списку.
+    """
+    if not files:
+        return []
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(lambda item: _timed_read(*item), files))
@@ -0,0 +1,90 @@
+import numpy as np
+
+# Довідник областей України для даних VHI.
+# NOAA нумерує області за англійською абеткою (provinceID у запиті), а в
+# лабораторних використовуються адміністративні індекси. Відповідність зберігається
+# масивом-таблицею: admin_id = noaa_to_admin[noaa_id], тому перетворення всього
+# стовпця - це одна векторизована вибірка за індексами.
+
+# Відповідність індексів NOAA адміністративним індексам
+region_mapping = {
+    1: 24, 2: 26, 3: 25, 4: 27, 5: 3, 6: 4, 7: 8,
+    8: 21, 9: 22, 10: 23, 11: 10, 12: 9, 13: 11, 14: 12,
+    15: 13, 16: 14, 17: 15, 18: 16, 19: 17, 20: 18, 21: 19,
+    22: 20, 23: 6, 24: 1, 25: 2, 26: 7, 27: 5
+}
+
+# Області в порядку індексів NOAA: назва NOAA, українська назва, тип
+noaa_regions = {
+    1: ("Cherkasy", "Черкаська", "oblast"),
+    2: ("Chernihiv", "Чернігівська", "oblast"),
+    3: ("Chernivtsi", "Чернівецька", "oblast"),
+    4: ("Crimea", "Автономна Республіка Крим", "republic"),
+    5: ("Dnipropetrovs'k", "Дніпропетровська", "oblast"),
+    6: ("Donets'k", "Донецька", "oblast"),
+    7: ("Ivano-Frankivs'k", "Івано-Франківська", "oblast"),
+    8: ("Kharkiv", "Харківська", "oblast"),
+    9: ("Kherson", "Херсонська", "oblast"),
+    10: ("Khmel'nyts'kyy", "Хмельницька", "oblast"),
+    11: ("Kiev", "Київська", "oblast"),
+    12: ("Kiev City", "м. Київ", "city"),
+    13: ("Kirovohrad", "Кіровоградська", "oblast"),
+    14: ("Luhans'k", "Луганська", "oblast"),
+    15: ("L'viv", "Львівська", "oblast"),
+    16: ("Mykolayiv", "Миколаївська", "oblast"),
+    17: ("Odessa", "Одеська", "oblast"),
+    18: ("Poltava", "Полтавська", "oblast"),
+    19: ("Rivne", "Рівненська", "oblast"),
+    20: ("Sevastopol'", "м. Севастополь", "city"),
+    21: ("Sumy", "Сумська", "oblast"),
+    22: ("Ternopil'", "Тернопільська", "oblast"),
+    23: ("Transcarpathia", "Закарпатська", "oblast"),
+    24: ("Vinnytsya", "Вінницька", "oblast"),
+    25: ("Volyn", "Волинська", "oblast"),
+    26: ("Zaporizhzhya", "Запорізька", "oblast"),
+    27: ("Zhytomyr", "Житомирська", "oblast"),
+}
+
+# Таблиця перетворення; 0 означає, що індекс NOAA невідомий
+noaa_to_admin = np.zeros(max(region_mapping) + 1, dtype=np.uint8)
+noaa_to_admin[list(region_mapping)] = list(region_mapping.values())
+
+admin_to_noaa = np.zeros(max(region_mapping.values()) + 1, dtype=np.uint8)
+admin_to_noaa[noaa_to_admin[list(region_mapping)]] = list(region_mapping)
+
+# Позначка в метаданих даних, у яких індекси вже адміністративні
+admin_ids = 'admin'
+
+def to_admin_ids(noaa_ids):
+    """Перетворює індекси NOAA на адміністративні однією вибіркою з таблиці."""
+    noaa_ids = np.asarray(noaa_ids)
+    if noaa_ids.size and (noaa_ids.min() < 1 or noaa_ids.max() >= len(noaa_to_admin)):
+        raise ValueError(f"Невідомий індекс області NOAA: {noaa_ids.min()}..{noaa_ids.max()}")
+    admin = noaa_to_admin[noaa_ids]
+    if not admin.all():
+        raise ValueError(f"Невідомий індекс області NOAA: {np.unique(noaa_ids[admin == 0]).tolist()}")
+    return admin
+
+def ensure_admin_ids(df):
+    """Переводить Region_ID у адміністративні індекси, якщо цього ще не зроблено.
+
+    Дані з позначкою df.attrs['region_ids'] == 'admin' повертаються без змін,
+    тому повторний виклик не змінює індекси вдруге.
+    """
+    if df.attrs.get('region_ids') == admin_ids:
+        return df
+    df["Region_ID"] = to_admin_ids(df["Region_ID"].to_numpy())
+    df.attrs['region_ids'] = admin_ids
+    return df
+
+def region_info(admin_id):
+    """Відомості про область за адміністративним індексом."""
+    noaa_id = int(admin_to_noaa[admin_id]) if 0 < admin_id < len(admin_to_noaa) else 0
+    if noaa_id == 0:
+        raise ValueError(f"Невідомий індекс області: {admin_id}")
+    noaa_name, name, kind = noaa_regions[noaa_id]
+    return {'admin_id': int(admin_id), 'noaa_id': noaa_id, 'name': name, 'noaa_name': noaa_name, 'kind': kind}
+
+def region_name(admin_id):
+    """Українська назва області за адміністративним індексом."""
+    return region_info(admin_id)['name']
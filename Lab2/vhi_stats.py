@@ -0,0 +1,91 @@
+import numpy as np
+import pandas as pd
+
+from vhi_ingest import column_types
+
+# Попередньо обчислена статистика індексу для кожної пари (область, рік).
+# Значення один раз впорядковуються за (область, рік, значення); після цього
+# мінімум, максимум, медіана і будь-які квантилі - це вибір елементів за позиціями
+# у відсортованому масиві, а запит для набору областей і років - пошук у таблиці.
+# Від'ємні значення (-1 у файлах NOAA позначає відсутні дані) не враховуються,
+# як і в DroughtEngine та AnomalyModel.
+
+default_quantiles = [0.1, 0.25, 0.75, 0.9]
+
+def quantile_name(q):
+    """Назва стовпця квантиля: 0.25 -> p25, 0.5 -> median."""
+    return 'median' if q == 0.5 else f"p{q * 100:g}"
+
+class StatsTable:
+    """Таблиця min/max/mean/median/квантилів/count по (область, рік) для одного індексу.
+
+    NaN і від'ємні значення вважаються відсутніми даними.
+    """
+
+    def __init__(self, df, column="VHI", quantiles=default_quantiles):
+        self.column = column
+        values = df[column].to_numpy(dtype=np.float64)
+        valid = values >= 0
+        region_ids = df["Region_ID"].to_numpy()[valid]
+        years = df["Year"].to_numpy().astype(np.int64)[valid]
+        values = values[valid]
+
+        self.regions = np.unique(region_ids)
+        self.years = np.arange(years.min(), years.max() + 1) if len(years) else np.empty(0, dtype=np.int64)
+        cells = np.searchsorted(self.regions, region_ids) * len(self.years) + (years - (self.years[0] if len(years) else 0))
+
+        # Одне сортування за (клітинка, значення) дає всі порядкові статистики
+        order = np.lexsort((values, cells))
+        self.sorted_values = values[order]
+        sorted_cells = cells[order]
+        starts = np.flatnonzero(np.r_[True, sorted_cells[1:] != sorted_cells[:-1]]) if len(order) else np.empty(0, dtype=np.int64)
+        self.starts = starts
+        self.counts = np.diff(np.append(starts, len(order)))
+        present = sorted_cells[starts]
+
+        # Позиція рядка таблиці для кожної клітинки (область x рік); -1 - немає даних
+        self.cell_rows = np.full(len(self.regions) * len(self.years), -1, dtype=np.int64)
+        self.cell_rows[present] = np.arange(len(present))
+        self.cell_rows = self.cell_rows.reshape(len(self.regions), len(self.years))
+
+        self.table = pd.DataFrame({
+            "Region_ID": self.regions[present // max(len(self.years), 1)].astype(column_types["Region_ID"]),
+            "Year": self.years[present % max(len(self.years), 1)].astype(column_types["Year"]),
+            "min": self.sorted_values[starts] if len(starts) else np.empty(0),
+            "max": self.sorted_values[starts + self.counts - 1] if len(starts) else np.empty(0),
+            "mean": np.add.reduceat(self.sorted_values, starts) / self.counts if len(starts) else np.empty(0),
+            "median": self.quantile(0.5),
+            "count": self.counts,
+        })
+        self.add_quantiles(quantiles)
+
+    def quantile(self, q):
+        """Квантиль q для кожної клітинки (лінійна інтерполяція, як у numpy і pandas)."""
+        position = self.starts + q * (self.counts - 1)
+        lower = np.floor(position).astype(np.int64)
+        upper = np.minimum(lower + 1, self.starts + self.counts - 1)
+        fraction = position - lower
+        return self.sorted_values[lower] + (self.sorted_values[upper] - self.sorted_values[lower]) * fraction
+
+    def add_quantiles(self, quantiles):
+        """Додає стовпці квантилів, використовуючи вже відсортовані значення."""
+        for q in quantiles:
+            name = quantile_name(q)
+            if name not in self.table:
+                self.table[name] = self.quantile(q)
+        return self
+
+    def lookup(self, region_ids, years, stats=("min", "max", "mean", "median")):
+        """Статистика для всіх наявних пар (область, рік) з вказаних областей і років.
+
+        Рядки впорядковані за областю і роком, як після groupby.
+        """
+        regions = np.searchsorted(self.regions, np.unique(region_ids))
+        regions = regions[regions < len(self.regions)]
+        regions = regions[np.isin(self.regions[regions], region_ids)]
+        year_positions = np.unique(np.asarray(years, dtype=np.int64)) - (self.years[0] if len(self.years) else 0)
+        year_positions = year_positions[(year_positions >= 0) & (year_positions < len(self.years))]
+
+        rows = self.cell_rows[np.ix_(regions, year_positions)].ravel()
+        rows = rows[rows >= 0]
+        return pd.DataFrame({name: self.table[name].to_numpy()[rows] for name in ["Region_ID", "Year", *stats]})
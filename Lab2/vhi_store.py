@@ -0,0 +1,218 @@
+import os
+import json
+import hashlib
+from datetime import datetime
+import numpy as np
+import pandas as pd
+
+from vhi_ingest import read_files, region_from_name, column_types, index_columns, default_workers
+from vhi_regions import to_admin_ids, admin_ids
+
+# Локальне сховище даних VHI: один стиснений стовпцевий файл (.npz) на область.
+# Рядки ідентифікуються ключем (рік, тиждень), а зміни визначаються хешем значень,
+# тому повторні завантаження тих самих даних не дублюють рядки, а оновлюються
+# лише нові або змінені тижні. Маніфест зберігає версії областей і вже оброблені CSV.
+# Індекси областей NOAA з імен файлів один раз перетворюються на адміністративні
+# під час запису, тому в сховищі (і в завантажених даних) вони вже адміністративні.
+
+store_version = 2
+manifest_name = 'manifest.json'
+key_columns = ["Year", "Week"]
+
+def store_dir_for(data_dir):
+    """Папка сховища всередині папки з CSV-файлами."""
+    return os.path.join(data_dir, 'store')
+
+def partition_path(store_dir, region_id):
+    return os.path.join(store_dir, f'region_{region_id}.npz')
+
+def read_manifest(store_dir):
+    """Читає маніфест сховища (або створює порожній)."""
+    path = os.path.join(store_dir, manifest_name)
+    if os.path.exists(path):
+        with open(path, encoding='utf-8') as file:
+            manifest = json.load(file)
+        if manifest.get('version') == store_version:
+            return manifest
+    return {'version': store_version, 'region_ids': admin_ids, 'regions': {}, 'files': {}}
+
+def write_manifest(store_dir, manifest):
+    """Записує маніфест через тимчасовий файл."""
+    path = os.path.join(store_dir, manifest_name)
+    temp_path = path + '.tmp'
+    with open(temp_path, 'w', encoding='utf-8') as file:
+        json.dump(manifest, file, indent=2, ensure_ascii=False)
+    os.replace(temp_path, path)
+
+def row_keys(years, weeks):
+    """Ключ рядка: рік * 100 + тиждень."""
+    return years.astype(np.int32) * 100 + weeks.astype(np.int32)
+
+def row_hashes(columns):
+    """64-бітний хеш значень індексів кожного рядка (FNV-1a по словах float32)."""
+    hashes = np.full(len(columns[index_columns[0]]), 0xcbf29ce484222325, dtype=np.uint64)
+    prime = np.uint64(0x100000001b3)
+    for name in index_columns:
+        words = np.ascontiguousarray(columns[name], dtype=np.float32).view(np.uint32).astype(np.uint64)
+        hashes = (hashes ^ words) * prime
+    return hashes
+
+def read_partition(store_dir, region_id):
+    """Стовпці області зі сховища (або None, якщо області ще немає)."""
+    path = partition_path(store_dir, region_id)
+    if not os.path.exists(path):
+        return None
+    with np.load(path) as archive:
+        return {name: archive[name] for name in archive.files}
+
+def write_partition(store_dir, region_id, columns):
+    path = partition_path(store_dir, region_id)
+    temp_path = path + '.tmp.npz'
+    np.savez_compressed(temp_path, **columns)
+    os.replace(temp_path, path)
+
+def _columns_of(df):
+    columns = {name: df[name].to_numpy(dtype=column_types[name]) for name in key_columns + index_columns}
+    # Якщо тиждень повторюється у файлі, залишається останній рядок
+    keys = row_keys(columns["Year"], columns["Week"])
+    _, last = np.unique(keys[::-1], return_index=True)
+    keep = np.sort(len(keys) - 1 - last)
+    columns = {name: values[keep] for name, values in columns.items()}
+    columns['hash'] = row_hashes(columns)
+    return columns
+
+def upsert(store_dir, region_id, df, manifest):
+    """Додає нові та оновлює змінені тижні області.
+
+    Повертає (кількість нових рядків, кількість змінених рядків);
+    якщо змін немає, файл області не перезаписується.
+    """
+    fresh = _columns_of(df)
+    old = read_partition(store_dir, region_id)
+    if old is None:
+        inserted, changed = len(fresh['hash']), 0
+        merged = fresh
+    else:
+        old_keys = row_keys(old["Year"], old["Week"])
+        new_keys = row_keys(fresh["Year"], fresh["Week"])
+        # Ключі розділу відсортовані, тому пошук виконується через searchsorted
+        positions = np.searchsorted(old_keys, new_keys)
+        found = positions < len(old_keys)
+        found[found] = old_keys[positions[found]] == new_keys[found]
+        differs = found.copy()
+        differs[found] = old['hash'][positions[found]] != fresh['hash'][found]
+        inserted, changed = int((~found).sum()), int(differs.sum())
+        if inserted == 0 and changed == 0:
+            return 0, 0
+
+        merged = {name: values.copy() for name, values in old.items()}
+        for name in merged:
+            merged[name][positions[differs]] = fresh[name][differs]
+            merged[name] = np.concatenate([merged[name], fresh[name][~found]])
+
+    order = np.argsort(row_keys(merged["Year"], merged["Week"]), kind='stable')
+    merged = {name: values[order] for name, values in merged.items()}
+    write_partition(store_dir, region_id, merged)
+
+    entry = manifest['regions'].get(str(region_id), {'version': 0})
+    entry.update(version=entry['version'] + 1, rows=len(order), inserted=inserted, changed=changed,
+                 updated=datetime.now().isoformat(timespec='seconds'))
+    manifest['regions'][str(region_id)] = entry
+    return inserted, changed
+
+def _file_signature(path):
+    stat = os.stat(path)
+    return {'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns}
+
+def _file_hash(path):
+    with open(path, 'rb') as file:
+        return hashlib.sha256(file.read()).hexdigest()
+
+def sync(data_dir, verbose=False, workers=default_workers):
+    """Переносить у сховище дані CSV-файлів папки, які ще не оброблялись.
+
+    Файли з тим самим вмістом (наприклад, копії з різними мітками часу)
+    обробляються лише один раз. Нові файли читаються паралельно, а записуються
+    у сховище по черзі. Повертає (маніфест сховища, час читання кожного файлу в секундах).
+    """
+    store_dir = store_dir_for(data_dir)
+    os.makedirs(store_dir, exist_ok=True)
+    manifest = read_manifest(store_dir)
+    if not manifest['files']:
+        # Новий маніфест (або сховище старої версії з індексами NOAA): старі розділи видаляються
+        for file in os.listdir(store_dir):
+            if file.startswith('region_') and file.endswith('.npz'):
+                os.remove(os.path.join(store_dir, file))
+        manifest['regions'] = {}
+    known_hashes = {entry['sha256'] for entry in manifest['files'].values()}
+
+    files = [f for f in os.listdir(data_dir) if f.endswith('.csv') and region_from_name(f) is not None]
+    # Старіші файли обробляються першими, щоб новіші дані перезаписували їх
+    files.sort(key=lambda f: os.path.getmtime(os.path.join(data_dir, f)))
+
+    pending = []
+    for file in files:
+        path = os.path.join(data_dir, file)
+        signature = _file_signature(path)
+        previous = manifest['files'].get(file)
+        if previous and all(previous[key] == value for key, value in signature.items()):
+            continue
+        digest = _file_hash(path)
+        manifest['files'][file] = {**signature, 'sha256': digest}
+        if digest in known_hashes:
+            continue
+        known_hashes.add(digest)
+        try:
+            pending.append((file, path, int(to_admin_ids(region_from_name(file)))))
+        except ValueError as e:
+            print(f"Помилка при читанні файлу {file}: {e}")
+            manifest['files'].pop(file)
+
+    results = read_files([(path, region_id) for _, path, region_id in pending], workers)
+    parse_times = {}
+    for (file, _, region_id), (df, seconds, error) in zip(pending, results):
+        parse_times[file] = seconds
+        try:
+            if error is not None:
+                raise error
+            inserted, changed = upsert(store_dir, region_id, df, manifest)
+        except Exception as e:
+            print(f"Помилка при читанні файлу {file}: {e}")
+            manifest['files'].pop(file)
+            continue
+        if verbose:
+            print(f"{file}: нових рядків {inserted}, змінених {changed}, читання {seconds * 1000:.1f} мс")
+
+    write_manifest(store_dir, manifest)
+    return manifest, parse_times
+
+def load_store(data_dir):
+    """Читає всі області зі сховища в один DataFrame з компактними типами."""
+    store_dir = store_dir_for(data_dir)
+    manifest = read_manifest(store_dir)
+    frames = []
+    for region in sorted(manifest['regions'], key=int):
+        columns = read_partition(store_dir, int(region))
+        if columns is None:
+            continue
+        columns.pop('hash')
+        df = pd.DataFrame(columns)
+        df["Region_ID"] = np.full(len(df), int(region), dtype=column_types["Region_ID"])
+        frames.append(df)
+    if not frames:
+        return pd.DataFrame()
+    df = pd.concat(frames, ignore_index=True)
+    df.attrs['region_ids'] = manifest['region_ids']
+    return df
+
+def load_data(data_dir, verbose=False):
+    """Оновлює сховище новими CSV-файлами та повертає всі дані.
+
+    Час читання нових файлів зберігається в df.attrs['parse_times'].
+    """
+    if not os.path.exists(data_dir):
+        return pd.DataFrame()
+    _, parse_times = sync(data_dir, verbose)
+    df = load_store(data_dir)
+    df.attrs['parse_times'] = parse_times
+    return df
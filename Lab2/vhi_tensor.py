@@ -0,0 +1,114 @@
+import warnings
+import numpy as np
+import pandas as pd
+
+from vhi_ingest import column_types, index_columns
+
+# Щільне представлення даних VHI: для кожного індексу масив float32 форми
+# (область, рік, тиждень), у якому відсутні тижні заповнені NaN. Вибірка області
+# за рік - це зріз масиву, а статистика за тижнями - згортка вздовж осі тижнів.
+
+class VhiTensor:
+    """Масиви індексів (область x рік x тиждень) з перетворенням у DataFrame і назад."""
+
+    def __init__(self, regions, years, weeks, values):
+        self.regions = np.asarray(regions)
+        self.years = np.asarray(years)
+        self.weeks = np.asarray(weeks)
+        self.values = values
+
+    @classmethod
+    def from_frame(cls, df, columns=index_columns):
+        """Будує масиви з DataFrame у довгому форматі (Year, Week, Region_ID, індекси)."""
+        regions = np.unique(df["Region_ID"].to_numpy())
+        year_values = df["Year"].to_numpy().astype(np.int64)
+        week_values = df["Week"].to_numpy().astype(np.int64)
+        years = np.arange(year_values.min(), year_values.max() + 1)
+        weeks = np.arange(1, max(int(week_values.max()), 52) + 1)
+        shape = (len(regions), len(years), len(weeks))
+
+        position = (np.searchsorted(regions, df["Region_ID"].to_numpy()), year_values - years[0], week_values - 1)
+        values = {}
+        for name in columns:
+            array = np.full(shape, np.nan, dtype=np.float32)
+            # Якщо тиждень повторюється, залишається останнє значення
+            array[position] = df[name].to_numpy(dtype=np.float32)
+            values[name] = array
+        return cls(regions, years, weeks, values)
+
+    def to_frame(self, columns=None):
+        """Перетворює масиви назад у довгий DataFrame; тижні без даних пропускаються."""
+        columns = list(columns or self.values)
+        present = np.zeros(self.shape, dtype=bool)
+        for name in columns:
+            present |= ~np.isnan(self.values[name])
+        r, y, w = np.nonzero(present)
+        frame = {"Year": self.years[y], "Week": self.weeks[w]}
+        frame.update({name: self.values[name][r, y, w] for name in columns})
+        frame["Region_ID"] = self.regions[r]
+        return pd.DataFrame(frame).astype({name: column_types[name] for name in frame})
+
+    @property
+    def shape(self):
+        return len(self.regions), len(self.years), len(self.weeks)
+
+    def region_position(self, region_ids):
+        """Позиції областей на першій осі (області, яких немає, пропускаються)."""
+        region_ids = np.atleast_1d(region_ids)
+        positions = np.searchsorted(self.regions, region_ids)
+        found = positions < len(self.regions)
+        found[found] = self.regions[positions[found]] == region_ids[found]
+        return positions[found]
+
+    def year_slice(self, start_year, end_year):
+        """Зріз осі років для інтервалу [start_year, end_year] включно."""
+        return slice(int(np.searchsorted(self.years, start_year)), int(np.searchsorted(self.years, end_year, 'right')))
+
+    def _frame(self, r, y, w, name, with_region):
+        frame = {"Year": self.years[y].astype(column_types["Year"]), "Week": self.weeks[w].astype(column_types["Week"])}
+        if with_region:
+            frame["Region_ID"] = self.regions[r].astype(column_types["Region_ID"])
+        frame[name] = self.values[name][r, y, w]
+        return pd.DataFrame(frame, copy=False)
+
+    def by_region_year(self, region_id, year, name="VHI"):
+        """Значення індексу для області за рік (Year, Week, індекс)."""
+        region = self.region_position(region_id)
+        years = self.year_slice(year, year)
+        if len(region) == 0 or years.start == years.stop:
+            return self._frame(*(np.empty(0, dtype=np.int64),) * 3, name, False)
+        week = np.flatnonzero(~np.isnan(self.values[name][region[0], years.start]))
+        return self._frame(np.full(len(week), region[0]), np.full(len(week), years.start), week, name, False)
+
+    def by_year_range(self, region_ids, start_year, end_year, name="VHI"):
+        """Значення індексу для областей за інтервал років (Year, Week, Region_ID, індекс)."""
+        regions = self.region_position(region_ids)
+        years = self.year_slice(start_year, end_year)
+        block = self.values[name][regions, years]
+        r, y, w = np.nonzero(~np.isnan(block))
+        return self._frame(regions[r], y + years.start, w, name, True)
+
+    def statistics(self, region_ids, years, name="VHI"):
+        """min, max, mean і median індексу по тижнях для кожної пари (область, рік).
+
+        Від'ємні значення (-1 у файлах NOAA) вважаються відсутніми даними, як у StatsTable.
+        """
+        regions = self.region_position(region_ids)
+        year_positions = np.searchsorted(self.years, np.atleast_1d(years))
+        year_positions = year_positions[(year_positions < len(self.years))]
+        year_positions = year_positions[np.isin(self.years[year_positions], years)]
+        year_positions = np.unique(year_positions)
+
+        block = self.values[name][np.ix_(regions, year_positions)]
+        block = np.where(block >= 0, block, np.nan)
+        has_data = ~np.all(np.isnan(block), axis=2)
+        # Для пар без даних numpy попереджає про порожній зріз; такі пари потім відкидаються
+        with warnings.catch_warnings():
+            warnings.simplefilter('ignore', RuntimeWarning)
+            stats = {"min": np.nanmin(block, axis=2), "max": np.nanmax(block, axis=2),
+                     "mean": np.nanmean(block, axis=2), "median": np.nanmedian(block, axis=2)}
+        r, y = np.nonzero(has_data)
+        frame = pd.DataFrame({"Region_ID": self.regions[regions[r]], "Year": self.years[year_positions[y]]})
+        for stat, values in stats.items():
+            frame[stat] = values[r, y]
+        return frame.astype({"Region_ID": column_types["Region_ID"], "Year": column_types["Year"]})
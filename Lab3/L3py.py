@@ -1,67 +1,152 @@
 import streamlit as st
 import pandas as pd
-import matplotlib.pyplot as plt
 import os
 import numpy as np
-import seaborn as sns
-import re
+import sys
+import functools
 
-def process_csv_files(data_dir):
-    all_data = pd.DataFrame()
-    
-    if not os.path.exists(data_dir):
-        os.makedirs(data_dir)
-        return all_data
-    
-    all_files = os.listdir(data_dir)
-    files = [f for f in all_files if f.endswith('.csv')]
-    
-    if not files:
-        return all_data
+# Спільні модулі для даних VHI знаходяться в папці Lab2
+lab2_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'Lab2')
+sys.path.insert(0, lab2_dir)
+from vhi_store import load_data
+from vhi_index import sort_frame, RegionYearWeekIndex
+from vhi_anomaly import AnomalyModel
+from vhi_regions import region_name
+import charts
+
+index_names = ["VCI", "TCI", "VHI"]
+
+# Кількість збережених результатів для вкладки "Порівняння областей"
+comparison_cache_size = 128
+
+def data_signature(data_dir):
+    """Список CSV-файлів папки з розмірами і часом зміни - ключ кешу даних."""
+    signature = []
+    for file in sorted(os.listdir(data_dir)):
+        if file.endswith('.csv'):
+            stat = os.stat(os.path.join(data_dir, file))
+            signature.append((file, stat.st_size, stat.st_mtime_ns))
+    return tuple(signature)
+
+# Дані читаються з диска лише при зміні списку файлів або їх часу зміни;
+# під час взаємодії з віджетами Streamlit повертає результат з кешу
+# Дані зберігаються впорядкованими за (Region_ID, Year, Week) для індексу вибірок
+@st.cache_data(show_spinner=False)
+def load_cached_data(data_dir, signature):
+    return sort_frame(load_data(data_dir))
+
+@st.cache_resource(show_spinner=False)
+def load_index(data_dir, signature):
+    return RegionYearWeekIndex(load_cached_data(data_dir, signature))
+
+@st.cache_resource(show_spinner=False)
+def load_aggregates(data_dir, signature):
+    return build_aggregates(load_cached_data(data_dir, signature))
+
+def build_aggregates(df):
+    """Суми та кількості значень індексів для кожної області, року і тижня.
+
+    Суми накопичуються вздовж тижнів, тому сума за будь-який інтервал тижнів
+    для всіх областей і років - це різниця двох зрізів масиву.
+    """
+    regions = np.sort(df['Region_ID'].unique())
+    years = np.arange(int(df['Year'].min()), int(df['Year'].max()) + 1)
+    min_week, max_week = int(df['Week'].min()), int(df['Week'].max())
+    shape = (len(regions), len(years), max_week - min_week + 1)
+
+    cells = np.ravel_multi_index((np.searchsorted(regions, df['Region_ID'].to_numpy()),
+                                  df['Year'].to_numpy() - years[0],
+                                  df['Week'].to_numpy() - min_week), shape)
+    size = int(np.prod(shape))
+    padding = [(0, 0), (0, 0), (1, 0)]
+    counts = np.bincount(cells, minlength=size).reshape(shape)
+    aggregates = {'regions': regions, 'years': years, 'weeks': (min_week, max_week),
+                  'counts': np.pad(np.cumsum(counts, axis=2), padding)}
+    for name in index_names:
+        sums = np.bincount(cells, weights=df[name].to_numpy(dtype=np.float64), minlength=size).reshape(shape)
+        aggregates[name] = np.pad(np.cumsum(sums, axis=2), padding)
+    return aggregates
+
+def range_sums(aggregates, name, years_range, weeks_range):
+    """Суми та кількості значень індексу (область x рік) за вибрані роки і тижні."""
+    years = aggregates['years']
+    year_part = slice(int(np.searchsorted(years, years_range[0])), int(np.searchsorted(years, years_range[1], 'right')))
+    min_week = aggregates['weeks'][0]
+    lo, hi = weeks_range[0] - min_week, weeks_range[1] - min_week + 1
+    sums = aggregates[name][:, year_part, hi] - aggregates[name][:, year_part, lo]
+    counts = aggregates['counts'][:, year_part, hi] - aggregates['counts'][:, year_part, lo]
+    return years[year_part], sums, counts
+
+@st.cache_resource(show_spinner=False)
+def load_anomalies(data_dir, signature, index_option):
+    return AnomalyModel(load_cached_data(data_dir, signature), index_option)
+
+def region_comparison(aggregates, index_option, years_range, weeks_range):
+    """Дані для вкладки "Порівняння областей": середні по областях і по роках.
+
+    Повертає None, якщо за вибраний період немає даних. Результат не залежить
+    від вибраної області, тому його можна повторно використовувати з кешу.
+    """
+    years, sums, counts = range_sums(aggregates, index_option, years_range, weeks_range)
+    if counts.sum() == 0:
+        return None
     
-    for file in files:
-        file_path = os.path.join(data_dir, file)
-        try:
-            df = pd.read_csv(file_path, skiprows=2, names=["Year", "Week", "SMN", "SMT", "VCI", "TCI", "VHI", "empty"])
-            
-            region_match = re.search(r'vhi_(\d+)', file)
-            if region_match:
-                df["Region_ID"] = int(region_match.group(1))
-            else:
-                continue
-                
-            all_data = pd.concat([all_data, df], ignore_index=True)
-        except Exception as e:
-            pass
+    region_counts = counts.sum(axis=1)
+    has_data = region_counts > 0
+    region_averages = pd.DataFrame({
+        'Region_ID': aggregates['regions'][has_data],
+        index_option: sums.sum(axis=1)[has_data] / region_counts[has_data]
+    }).sort_values(by=index_option)
     
-    if not all_data.empty:
-        all_data.drop(columns=["empty"], inplace=True, errors='ignore')
-        all_data.dropna(subset=["VHI"], inplace=True)
-        
-        all_data['Year'] = all_data['Year'].apply(lambda x: re.sub(r'<[^>]+>', '', str(x)))
-        all_data['Year'] = pd.to_numeric(all_data['Year'], errors='coerce')
+    year_counts = counts.sum(axis=0)
+    all_years = year_counts > 0
+    with np.errstate(invalid='ignore', divide='ignore'):
+        region_yearly = sums / counts
+    return {
+        'region_averages': region_averages,
+        'years': years,
+        'region_yearly': region_yearly,
+        'all_regions_yearly': pd.Series(sums.sum(axis=0)[all_years] / year_counts[all_years],
+                                        index=pd.Index(years[all_years], name='Year')),
+    }
+
+# Обмежений LRU-кеш результатів за ключем (індекс, роки, тижні); створюється заново
+# при зміні даних. Зміна області чи сортування не потребує нових обчислень
+@st.cache_resource(show_spinner=False)
+def comparison_cache(data_dir, signature):
+    aggregates = load_aggregates(data_dir, signature)
     
-    return all_data
+    @functools.lru_cache(maxsize=comparison_cache_size)
+    def cached(index_option, years_range, weeks_range):
+        return region_comparison(aggregates, index_option, years_range, weeks_range)
+    return cached
 
 def main():
     st.set_page_config(layout="wide")
     st.title("Аналіз вегетаційного індексу здоров’я (VHI)")
     
-    data_dir = "D:\KPI\APD\git\Lab\Lab2\data"
+    data_dir = os.path.join(lab2_dir, "data")
     
-    # Автоматичне завантаження даних при запуску
+    # Автоматичне завантаження даних при запуску (з кешу, якщо файли не змінились)
     if os.path.exists(data_dir):
+        signature = data_signature(data_dir)
         with st.spinner("Завантажуємо дані..."):
-            df = process_csv_files(data_dir)
+            df = load_cached_data(data_dir, signature)
         
         if not df.empty:
             st.session_state['data'] = df
+            st.session_state['aggregates'] = load_aggregates(data_dir, signature)
+            st.session_state['index'] = load_index(data_dir, signature)
+            st.session_state['comparison'] = comparison_cache(data_dir, signature)
         else:
             st.error("Не вдалося завантажити дані. DataFrame порожній.")
     
     # Перевіряємо, чи завантажені дані
     if 'data' in st.session_state and not st.session_state['data'].empty:
         df = st.session_state['data']
+        aggregates = st.session_state['aggregates']
+        index = st.session_state['index']
+        comparison = st.session_state['comparison']
         
         # Створюємо двоколонковий макет
         col1, col2 = st.columns([1, 3])
@@ -77,15 +162,16 @@ def main():
             )
             
             # 2. Dropdown для вибору області
-            regions = sorted(df['Region_ID'].unique())
+            regions = aggregates['regions'].tolist()
             selected_region = st.selectbox(
                 "Оберіть область",
                 regions,
+                format_func=lambda region_id: f"{region_id}: {region_name(region_id)}",
                 key="selected_region"
             )
             
             # 3. Slider для інтервалу тижнів
-            min_week, max_week = int(df['Week'].min()), int(df['Week'].max())
+            min_week, max_week = aggregates['weeks']
             weeks_range = st.slider(
                 "Оберіть інтервал тижнів",
                 min_week, max_week, (min_week, max_week),
@@ -93,9 +179,7 @@ def main():
             )
             
             # 4. Slider для інтервалу років
-            years = sorted(df['Year'].unique())
-            years = [y for y in years if not pd.isna(y)]
-            min_year, max_year = int(min(years)), int(max(years))
+            min_year, max_year = int(aggregates['years'][0]), int(aggregates['years'][-1])
             years_range = st.slider(
                 "Оберіть інтервал років",
                 min_year, max_year, (min_year, max_year),
@@ -118,14 +202,8 @@ def main():
                 st.rerun()
         
         with col2:
-            # Фільтрація даних на основі вибраних параметрів
-            filtered_data = df[
-                (df['Region_ID'] == selected_region) & 
-                (df['Year'] >= years_range[0]) & 
-                (df['Year'] <= years_range[1]) &
-                (df['Week'] >= weeks_range[0]) & 
-                (df['Week'] <= weeks_range[1])
-            ]
+            # Фільтрація даних на основі вибраних параметрів (зрізи за індексом замість масок по всіх рядках)
+            filtered_data = index.select(df, selected_region, years_range, weeks_range)
             
             # Сортування даних (якщо обрано обидва чекбокси — пріоритет за зростанням)
             if sort_asc and not sort_desc:
@@ -137,7 +215,7 @@ def main():
                 filtered_data = filtered_data.sort_values(by=index_option, ascending=True)
             
             # 6. Створення вкладок для таблиці та графіків
-            tab1, tab2, tab3 = st.tabs(["Таблиця даних", "Графік динаміки", "Порівняння областей"])
+            tab1, tab2, tab3, tab4 = st.tabs(["Таблиця даних", "Графік динаміки", "Порівняння областей", "Аномалії"])
             
             with tab1:
                 st.subheader(f"Таблиця даних для області {selected_region}")
@@ -147,93 +225,74 @@ def main():
                 st.subheader(f"Динаміка {index_option} для області {selected_region}")
                 
                 if not filtered_data.empty:
-                    # Групуємо дані за роком і тижнем для наочності
-                    pivoted_data = filtered_data.pivot_table(
-                        index='Week', 
-                        columns='Year', 
-                        values=index_option,
-                        aggfunc='mean'
-                    )
-                    
-                    fig, ax = plt.subplots(figsize=(12, 6))
-                    pivoted_data.plot(ax=ax, marker='o', linestyle='-')
-                    ax.set_xlabel('Тиждень')
-                    ax.set_ylabel(index_option)
-                    ax.set_title(f'{index_option} для області {selected_region} ({years_range[0]}-{years_range[1]})')
-                    ax.grid(True)
-                    ax.legend(title='Рік')
-                    st.pyplot(fig)
+                    # Графік малюється в браузері; передаються лише рік, тиждень і значення
+                    chart = charts.week_lines_chart(
+                        filtered_data, index_option,
+                        f'{index_option} для області {selected_region} ({years_range[0]}-{years_range[1]})')
+                    st.altair_chart(chart, use_container_width=True)
                 else:
                     st.warning(f"Немає даних для області {selected_region} за вибраний період")
             
             with tab3:
                 st.subheader(f"Порівняння  {index_option} по областях")
                 
-                # Отримуємо дані по всіх областях за вибраний часовий інтервал
-                all_regions_data = df[
-                    (df['Year'] >= years_range[0]) & 
-                    (df['Year'] <= years_range[1]) &
-                    (df['Week'] >= weeks_range[0]) & 
-                    (df['Week'] <= weeks_range[1])
-                ]
+                # Середні по областях і роках за вибраний часовий інтервал (з кешу, якщо вже обчислювались)
+                result = comparison(index_option, tuple(years_range), tuple(weeks_range))
                 
-                if not all_regions_data.empty:
-                    # Розраховуємо середні значення індексу для кожної області
-                    region_averages = all_regions_data.groupby('Region_ID')[index_option].mean().reset_index()
-                    
-                    # Виділяємо вибрану область
-                    region_averages['Highlighted'] = region_averages['Region_ID'] == selected_region
-                    
-                    # Створюємо графік
-                    fig, ax = plt.subplots(figsize=(12, 6))
-                    
-                    # Сортуємо дані за значенням індексу для кращої візуалізації
-                    region_averages = region_averages.sort_values(by=index_option)
-                    
-                    # Створюємо кольорову мапу: вибрана область — червона, інші — сірі
-                    colors = ['red' if highlighted else 'gray' for highlighted in region_averages['Highlighted']]
-                    
-                    # Додаємо підписи та сітку
-                    bars = ax.bar(region_averages['Region_ID'].astype(str), region_averages[index_option], color=colors)
-                    
-                    # Добавляем подписи и сетку
-                    ax.set_xlabel('Область  (ID)')
-                    ax.set_ylabel(f'Середнє значення {index_option}')
-                    ax.set_title(f'Порівняння середнього {index_option} по областям ({years_range[0]}-{years_range[1]})')
-                    ax.grid(axis='y', linestyle='--', alpha=0.7)
-                    
-                    # Додаємо анотацію для вибраної області
-                    for i, bar in enumerate(bars):
-                        if region_averages.iloc[i]['Highlighted']:
-                            height = bar.get_height()
-                            ax.text(bar.get_x() + bar.get_width()/2., height + 0.1,
-                                f"Область {selected_region}",
-                                ha='center', va='bottom', rotation=0,
-                                color='red', fontweight='bold')
-
-                    
-                    st.pyplot(fig)
+                if result is not None:
+                    # Дані вже відсортовані за значенням індексу для кращої візуалізації;
+                    # вибрана область виділяється червоним і підписується на графіку
+                    chart = charts.region_bar_chart(
+                        result['region_averages'], index_option, selected_region,
+                        f'Порівняння середнього {index_option} по областям ({years_range[0]}-{years_range[1]})')
+                    st.altair_chart(chart, use_container_width=True)
                     
                     # Лінійний графік для порівняння динаміки вибраної області зі середнім по всіх
                     st.subheader(f"Динаміка {index_option} по роках: область {selected_region} vs середнє")
                     
-                    # Обчислюємо середні значення по роках 
-                    selected_region_yearly = all_regions_data[all_regions_data['Region_ID'] == selected_region].groupby('Year')[index_option].mean()
-                    all_regions_yearly = all_regions_data.groupby('Year')[index_option].mean()
-                    
-                    fig2, ax2 = plt.subplots(figsize=(12, 6))
-                    selected_region_yearly.plot(ax=ax2, marker='o', linestyle='-', color='red', label=f'Область {selected_region}')
-                    all_regions_yearly.plot(ax=ax2, marker='s', linestyle='--', color='blue', label='Середнє по всім областям')
-                    
-                    ax2.set_xlabel('Рік')
-                    ax2.set_ylabel(index_option)
-                    ax2.set_title(f'Порівняння динаміки {index_option} по рокам')
-                    ax2.grid(True)
-                    ax2.legend()
+                    # Середні значення по роках 
+                    years = result['years']
+                    region_yearly = result['region_yearly'][regions.index(selected_region)]
+                    region_years = ~np.isnan(region_yearly)
+                    selected_region_yearly = pd.Series(region_yearly[region_years],
+                                                       index=pd.Index(years[region_years], name='Year'))
+                    all_regions_yearly = result['all_regions_yearly']
                     
-                    st.pyplot(fig2)
+                    chart = charts.yearly_comparison_chart(
+                        selected_region_yearly, all_regions_yearly, index_option, selected_region,
+                        f'Порівняння динаміки {index_option} по рокам')
+                    st.altair_chart(chart, use_container_width=True)
                 else:
                     st.warning("Немає даних за вибраний період")
+            
+            with tab4:
+                st.subheader(f"Аномалії {index_option} відносно багаторічної норми: область {selected_region}")
+                
+                # Норма по тижнях року і ковзні середні рахуються один раз для всіх областей
+                model = load_anomalies(data_dir, signature, index_option)
+                anomalies = model.region_frame(selected_region, years_range[0], years_range[1])
+                
+                if not anomalies.empty:
+                    chart = charts.anomaly_chart(
+                        anomalies, index_option, model.windows,
+                        f'{index_option}: z-оцінки та ковзні середні ({years_range[0]}-{years_range[1]})')
+                    st.altair_chart(chart, use_container_width=True)
+                    st.dataframe(anomalies)
+                else:
+                    st.warning(f"Немає даних для області {selected_region} за вибраний період")
+        
+        # Налагоджувальна інформація про кеш вкладки "Порівняння областей"
+        with st.sidebar:
+            if st.checkbox("Налагодження", key="debug"):
+                info = comparison.cache_info()
+                st.write(f"Кеш порівняння областей: влучань {info.hits}, промахів {info.misses}, "
+                         f"записів {info.currsize} з {info.maxsize}")
+                # Час читання файлів, які були прочитані під час останнього оновлення сховища
+                parse_times = st.session_state['data'].attrs.get('parse_times', {})
+                if parse_times:
+                    st.write(f"Прочитано нових файлів: {len(parse_times)}, "
+                             f"сумарний час читання {sum(parse_times.values()) * 1000:.1f} мс")
+                    st.dataframe(pd.Series(parse_times, name="с").sort_values(ascending=False))
     else:
         st.warning("Дані не завантажено. Перевірте наявність файлів у директорії 'data'.")
 
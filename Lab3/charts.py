@@ -0,0 +1,107 @@
+import numpy as np
+import pandas as pd
+import altair as alt
+
+# Графіки дашборду VHI.
+# Графіки будуються як специфікації Vega-Lite (Altair) і малюються в браузері:
+# Streamlit передає лише компактні таблиці даних (Arrow), а не растрові зображення,
+# і на сервері не залишаються фігури matplotlib між перезапусками скрипта.
+
+# Максимальна кількість точок одного ряду, що передається в браузер
+max_points = 500
+
+chart_height = 400
+
+def downsample(x, y, limit=max_points):
+    """Зменшує кількість точок ряду, зберігаючи мінімум і максимум кожного інтервалу.
+
+    Ряд ділиться на limit / 2 рівних за кількістю точок інтервалів; з кожного
+    залишаються точки з найменшим і найбільшим значенням у початковому порядку.
+    """
+    x, y = np.asarray(x), np.asarray(y)
+    if len(x) <= limit:
+        return x, y
+    buckets = limit // 2
+    bounds = np.linspace(0, len(x), buckets + 1).astype(np.int64)
+    bucket = np.repeat(np.arange(buckets), np.diff(bounds))
+    # NaN не повинні потрапляти в мінімум чи максимум інтервалу
+    low = np.where(np.isnan(y), np.inf, y)
+    high = np.where(np.isnan(y), -np.inf, y)
+    order_min = np.lexsort((low, bucket))
+    order_max = np.lexsort((-high, bucket))
+    keep = np.unique(np.concatenate([order_min[bounds[:-1]], order_max[bounds[:-1]]]))
+    return x[keep], y[keep]
+
+def week_lines_chart(data, index_option, title):
+    """Лінії значення індексу по тижнях, окрема лінія для кожного року."""
+    frame = data[['Year', 'Week', index_option]].rename(columns={index_option: 'value'})
+    # Один рядок на (рік, тиждень), як у pivot_table з aggfunc='mean'
+    frame = frame.groupby(['Year', 'Week'], as_index=False, sort=False)['value'].mean()
+    frame['value'] = frame['value'].astype(np.float32)
+    return alt.Chart(frame, title=title, height=chart_height).mark_line(point=True).encode(
+        x=alt.X('Week:Q', title='Тиждень'),
+        y=alt.Y('value:Q', title=index_option),
+        color=alt.Color('Year:O', title='Рік', scale=alt.Scale(scheme='viridis')),
+        tooltip=['Year:O', 'Week:Q', alt.Tooltip('value:Q', title=index_option, format='.2f')],
+    ).interactive()
+
+def region_bar_chart(region_averages, index_option, selected_region, title):
+    """Стовпчики середнього значення по областях; вибрана область виділена червоним."""
+    frame = pd.DataFrame({
+        'region': region_averages['Region_ID'].astype(str).to_numpy(),
+        'value': region_averages[index_option].to_numpy(dtype=np.float32),
+        'selected': (region_averages['Region_ID'] == selected_region).to_numpy(),
+    })
+    # Порядок стовпчиків - як у вхідних даних (відсортованих за значенням)
+    x = alt.X('region:N', title='Область  (ID)', sort=frame['region'].tolist())
+    base = alt.Chart(frame, title=title, height=chart_height)
+    bars = base.mark_bar().encode(
+        x=x,
+        y=alt.Y('value:Q', title=f'Середнє значення {index_option}'),
+        color=alt.condition(alt.datum.selected, alt.value('red'), alt.value('gray')),
+        tooltip=[alt.Tooltip('region:N', title='Область'), alt.Tooltip('value:Q', title=index_option, format='.2f')],
+    )
+    label = base.transform_filter(alt.datum.selected).mark_text(
+        dy=-8, color='red', fontWeight='bold').encode(x=x, y='value:Q', text=alt.value(f"Область {selected_region}"))
+    return bars + label
+
+def yearly_comparison_chart(selected_series, all_series, index_option, selected_region, title):
+    """Динаміка по роках: вибрана область і середнє по всіх областях."""
+    frames = []
+    for name, series in [(f'Область {selected_region}', selected_series), ('Середнє по всім областям', all_series)]:
+        x, y = downsample(series.index.to_numpy(), series.to_numpy(dtype=np.float64))
+        frames.append(pd.DataFrame({'Year': x, 'value': y.astype(np.float32), 'series': name}))
+    frame = pd.concat(frames, ignore_index=True)
+    names = frame['series'].unique().tolist()
+    return alt.Chart(frame, title=title, height=chart_height).mark_line(point=True).encode(
+        x=alt.X('Year:Q', title='Рік', axis=alt.Axis(format='d')),
+        y=alt.Y('value:Q', title=index_option),
+        color=alt.Color('series:N', title=None, scale=alt.Scale(domain=names, range=['red', 'blue'])),
+        strokeDash=alt.StrokeDash('series:N', scale=alt.Scale(domain=names, range=[[1, 0], [5, 3]]), legend=None),
+        tooltip=['series:N', alt.Tooltip('Year:Q', format='d'), alt.Tooltip('value:Q', title=index_option, format='.2f')],
+    ).interactive()
+
+def anomaly_chart(frame, index_option, windows, title):
+    """z-оцінки відносно норми (стовпчики) і ковзні середні індексу (лінії)."""
+    time = pd.to_datetime(frame['Year'].astype(str) + '-01-01') + pd.to_timedelta((frame['Week'] - 1) * 7, unit='D')
+    x, z = downsample(time.to_numpy(), frame['zscore'].to_numpy(dtype=np.float64))
+    zscores = pd.DataFrame({'time': x, 'zscore': z.astype(np.float32)})
+    lines = []
+    for window in windows:
+        x, y = downsample(time.to_numpy(), frame[f'rolling_{window}'].to_numpy(dtype=np.float64))
+        lines.append(pd.DataFrame({'time': x, 'value': y.astype(np.float32), 'series': f'{window} тижнів'}))
+    lines = pd.concat(lines, ignore_index=True)
+
+    bars = alt.Chart(zscores, height=chart_height // 2).mark_bar().encode(
+        x=alt.X('time:T', title=None),
+        y=alt.Y('zscore:Q', title='z-оцінка'),
+        color=alt.condition(alt.datum.zscore < 0, alt.value('firebrick'), alt.value('seagreen')),
+        tooltip=[alt.Tooltip('time:T', title='Тиждень'), alt.Tooltip('zscore:Q', format='.2f')],
+    )
+    rolling = alt.Chart(lines, height=chart_height).mark_line().encode(
+        x=alt.X('time:T', title='Час'),
+        y=alt.Y('value:Q', title=f'Ковзне середнє {index_option}'),
+        color=alt.Color('series:N', title='Вікно'),
+        tooltip=['series:N', alt.Tooltip('time:T', title='Тиждень'), alt.Tooltip('value:Q', format='.2f')],
+    )
+    return alt.vconcat(rolling, bars, title=title).resolve_scale(x='shared')
@@ -0,0 +1,187 @@
+import gc
+import json
+import time
+import platform
+import tracemalloc
+from datetime import datetime
+import numpy as np
+import pandas as pd
+
+# Налаштування за замовчуванням
+default_repeats = 5
+default_warmup = 1
+default_threshold = 0.10
+
+# Пікове RSS окремого завдання вимірюється лише в Linux: запис "5" у
+# /proc/self/clear_refs скидає пік (VmHWM) до поточного RSS процесу. В інших
+# системах пік можна отримати лише для всього процесу, тому він не вимірюється.
+def _status_bytes(field):
+    """Значення поля з /proc/self/status у байтах (або None)."""
+    try:
+        with open('/proc/self/status') as file:
+            for line in file:
+                if line.startswith(field + ':'):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        return None
+    return None
+
+def reset_peak_rss():
+    """Скидає пікове RSS процесу до поточного; повертає False, якщо це неможливо."""
+    try:
+        with open('/proc/self/clear_refs', 'w') as file:
+            file.write('5')
+        return True
+    except OSError:
+        return False
+
+def peak_rss_bytes():
+    """Пікове RSS процесу після останнього скидання (або None)."""
+    return _status_bytes('VmHWM')
+
+def current_rss_bytes():
+    """Поточне RSS процесу (або None)."""
+    return _status_bytes('VmRSS')
+
+def _describe_result(result):
+    """Стисле представлення результату завдання для збереження у JSON."""
+    if isinstance(result, dict):
+        return {'result': {key: float(value) for key, value in result.items()
+                           if isinstance(value, (int, float, np.number))}}
+    if hasattr(result, '__len__'):
+        return {'result_len': len(result)}
+    return {}
+
+def measure_allocations(func):
+    """Пік виділеної пам'яті та кількість нових блоків за один виклик (tracemalloc)."""
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    func()
+    after = tracemalloc.take_snapshot()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    blocks = sum(stat.count_diff for stat in after.compare_to(before, 'filename') if stat.count_diff > 0)
+    return peak, blocks
+
+def benchmark(func, repeats=default_repeats, warmup=default_warmup, disable_gc=True, allocations=True):
+    """Вимірює час виконання функції та повертає статистику.
+
+    Перші warmup викликів не враховуються. Під час вимірювань збирач сміття
+    вимкнено, щоб його паузи не потрапляли у час окремих запусків. Виділення
+    пам'яті вимірюються окремим викликом, бо tracemalloc уповільнює код.
+    """
+    for _ in range(warmup):
+        func()
+
+    times = []
+    result = None
+    gc.collect()
+    # Пік пам'яті рахується лише для вимірюваних викликів цього завдання
+    rss_tracked = reset_peak_rss()
+    rss_before = current_rss_bytes()
+    gc_was_enabled = gc.isenabled()
+    if disable_gc:
+        gc.disable()
+    try:
+        for _ in range(repeats):
+            start = time.perf_counter()
+            result = func()
+            times.append(time.perf_counter() - start)
+    finally:
+        if gc_was_enabled:
+            gc.enable()
+
+    peak_rss = peak_rss_bytes() if rss_tracked else None
+    times = np.array(times)
+    stats = {
+        'time': float(np.median(times)),
+        'median': float(np.median(times)),
+        'mean': float(np.mean(times)),
+        'p95': float(np.percentile(times, 95)),
+        'stddev': float(np.std(times, ddof=1)) if repeats > 1 else 0.0,
+        'min': float(np.min(times)),
+        'max': float(np.max(times)),
+        'repeats': repeats,
+        'warmup': warmup,
+        'peak_rss_bytes': peak_rss,
+        'rss_growth_bytes': peak_rss - rss_before if peak_rss is not None and rss_before is not None else None,
+    }
+    if allocations:
+        stats['alloc_peak_bytes'], stats['alloc_blocks'] = measure_allocations(func)
+
+    stats.update(_describe_result(result))
+    return stats
+
+def run_suite(tasks, repeats=default_repeats, warmup=default_warmup, **options):
+    """Виконує benchmark для кожного завдання зі словника {назва: функція}."""
+    results = {}
+    for name, func in tasks.items():
+        try:
+            results[name] = benchmark(func, repeats=repeats, warmup=warmup, **options)
+        except Exception as e:
+            nan = float('nan')
+            results[name] = {'time': nan, 'median': nan, 'p95': nan, 'stddev': nan, 'error': str(e)}
+    return results
+
+def environment_info():
+    """Відомості про середовище, у якому виконувались вимірювання."""
+    return {
+        'timestamp': datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'numpy': np.__version__,
+        'pandas': pd.__version__,
+    }
+
+def save_results(suites, path, **meta):
+    """Зберігає результати наборів вимірювань у JSON."""
+    document = {'meta': {**environment_info(), **meta}, 'suites': suites}
+    with open(path, 'w', encoding='utf-8') as file:
+        json.dump(document, file, indent=2, ensure_ascii=False)
+    return document
+
+def load_results(path):
+    """Читає збережені результати вимірювань."""
+    with open(path, encoding='utf-8') as file:
+        return json.load(file)
+
+def compare_results(current, baseline, threshold=default_threshold):
+    """Порівнює медіани з базовими результатами і повертає список регресій.
+
+    Регресією вважається зростання медіанного часу більше ніж на threshold
+    (частка від базового значення).
+    """
+    regressions = []
+    for suite, tasks in current['suites'].items():
+        for task, stats in tasks.items():
+            base = baseline['suites'].get(suite, {}).get(task)
+            if base is None or not base['median']:
+                continue
+            change = stats['median'] / base['median'] - 1
+            if change > threshold:
+                regressions.append({'suite': suite, 'task': task, 'baseline': base['median'],
+                                    'current': stats['median'], 'change': change})
+    return regressions
+
+def print_suite(name, results):
+    """Виводить таблицю статистики для набору вимірювань."""
+    print(f"\n--- Benchmark: {name} ---")
+    print(f"{'Завдання':<10}{'медіана, с':>14}{'p95, с':>12}{'std, с':>12}"
+          f"{'RSS, МБ':>10}{'+RSS, МБ':>10}{'виділено, МБ':>14}{'блоків':>10}")
+    megabytes = lambda value: f"{value / 2**20:.1f}" if value is not None else '-'
+    for task, stats in results.items():
+        print(f"{task:<10}{stats['median']:>14.6f}{stats['p95']:>12.6f}{stats['stddev']:>12.6f}"
+              f"{megabytes(stats.get('peak_rss_bytes')):>10}{megabytes(stats.get('rss_growth_bytes')):>10}"
+              f"{megabytes(stats.get('alloc_peak_bytes')):>14}"
+              f"{stats.get('alloc_blocks', '-'):>10}")
+
+def print_regressions(regressions, threshold=default_threshold):
+    """Виводить список регресій відносно базових результатів."""
+    if not regressions:
+        print(f"\nРегресій (понад {threshold * 100:.0f}%) не виявлено.")
+        return
+    print(f"\nРегресії (понад {threshold * 100:.0f}%):")
+    for item in regressions:
+        print(f"{item['suite']}/{item['task']}: {item['baseline']:.6f} с -> "
+              f"{item['current']:.6f} с (+{item['change'] * 100:.1f}%)")
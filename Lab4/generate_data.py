@@ -0,0 +1,168 @@
+import argparse
+import time
+import numpy as np
+
+import timestamps
+
+# Генератор синтетичних даних у форматі UCI household_power_consumption.txt.
+# Дані генеруються блоками фіксованого розміру, а кожен блок має власне зерно
+# генератора, тому файл однаковий при однаковому seed незалежно від обсягу пам'яті.
+
+header = "Date;Time;Global_active_power;Global_reactive_power;Voltage;Global_intensity;" \
+         "Sub_metering_1;Sub_metering_2;Sub_metering_3\n"
+
+block_rows = 1 << 18
+default_start = (2006, 12, 16, 17 * 60 + 24)
+
+def parse_rows(text):
+    """Перетворює "1M", "10m", "500k" або "1000" на кількість рядків."""
+    text = str(text).strip().lower()
+    multipliers = {'k': 10**3, 'm': 10**6, 'g': 10**9}
+    if text[-1] in multipliers:
+        return int(float(text[:-1]) * multipliers[text[-1]])
+    return int(text)
+
+def _daily_profile(hours, weekdays):
+    """Типова добова крива навантаження: ранковий та вечірній піки, вихідні вищі."""
+    morning = 0.9 * np.exp(-((hours - 8.0) / 1.5) ** 2)
+    evening = 1.6 * np.exp(-((hours - 20.5) / 2.0) ** 2)
+    weekend = np.where(weekdays >= 5, 1.2, 1.0)
+    return (0.35 + morning + evening) * weekend
+
+def _missing_mask(rng, rows, missing_rate, mean_gap):
+    """Маска пропусків ('?'): суцільні інтервали з середньою довжиною mean_gap хвилин."""
+    mask = np.zeros(rows, dtype=bool)
+    if missing_rate <= 0:
+        return mask
+    events = rng.poisson(rows * missing_rate / mean_gap)
+    starts = rng.integers(0, rows, size=events)
+    lengths = rng.geometric(1.0 / mean_gap, size=events)
+    for start, length in zip(starts, lengths):
+        mask[start:start + length] = True
+    return mask
+
+def generate_block(seed, block_index, first_minute, rows, missing_rate=0.0125, mean_gap=30):
+    """Генерує стовпці одного блоку; значення зберігаються в тисячних частках."""
+    rng = np.random.default_rng([seed, block_index])
+    minutes = first_minute + np.arange(rows, dtype=np.int64)
+    hours = (minutes % timestamps.minutes_per_day) / 60.0
+    weekdays = timestamps.weekday_of(minutes)
+    day_of_year = (minutes // timestamps.minutes_per_day) % 365
+    seasonal = 1.0 + 0.35 * np.cos(2 * np.pi * (day_of_year - 15) / 365)
+    profile = _daily_profile(hours, weekdays) * seasonal
+
+    # Лічильники (Вт·год за хвилину): кухня, пральня, бойлер і кондиціонер
+    evening = (hours >= 18) & (hours < 23)
+    meals = ((hours >= 7) & (hours < 9)) | ((hours >= 12) & (hours < 14)) | evening
+    sub1 = np.where(meals & (rng.random(rows) < 0.08), rng.integers(1, 40, rows), 0)
+    sub2 = np.where(rng.random(rows) < 0.12, rng.integers(1, 75, rows), rng.integers(0, 3, rows))
+    heater_on = rng.random(rows) < np.clip(0.15 + 0.2 * profile, 0, 0.9)
+    sub3 = np.where(heater_on, rng.integers(16, 20, rows), rng.integers(0, 2, rows))
+
+    # Загальна активна потужність (кВт) не менша, ніж споживання лічильників
+    active = profile * rng.gamma(2.0, 0.45, rows)
+    active = np.maximum(active, (sub1 + sub2 + sub3) * 60 / 1000 + rng.gamma(2.0, 0.1, rows))
+    active = np.clip(np.round(active / 0.002) * 2, 76, 11122).astype(np.int64)
+
+    reactive = np.where(rng.random(rows) < 0.2, 0, rng.gamma(1.5, 80, rows))
+    reactive = np.clip(np.round(reactive / 2) * 2, 0, 1390).astype(np.int64)
+
+    voltage = 241.0 - 0.4 * active / 1000 + rng.normal(0, 2.5, rows)
+    voltage = np.clip(np.round(voltage * 100) * 10, 223200, 254150).astype(np.int64)
+
+    intensity = np.maximum(np.round(active * 1000 / voltage / 0.2) * 200, 200).astype(np.int64)
+
+    columns = {
+        'minutes': minutes,
+        'Global_active_power': active,
+        'Global_reactive_power': reactive,
+        'Voltage': voltage,
+        'Global_intensity': intensity,
+        'Sub_metering_1': sub1.astype(np.int64) * 1000,
+        'Sub_metering_2': sub2.astype(np.int64) * 1000,
+        'Sub_metering_3': sub3.astype(np.int64) * 1000,
+    }
+    return columns, _missing_mask(rng, rows, missing_rate, mean_gap)
+
+def _put_digits(matrix, column, values, width, pad_leading=True):
+    """Записує числа у width стовпців матриці; провідні нулі замінюються байтом 0."""
+    for position in range(width):
+        power = 10 ** (width - 1 - position)
+        digit = (values // power) % 10
+        byte = digit + ord('0')
+        if pad_leading and position < width - 1:
+            byte = np.where(values >= power, byte, 0)
+        matrix[:, column + position] = byte
+
+def format_block(columns, missing):
+    """Формує текст блоку як матрицю байтів і видаляє байти-заповнювачі одним кроком."""
+    rows = len(columns['minutes'])
+    width = 10 + 1 + 8 + 1 + 7 * 8
+    matrix = np.zeros((rows, width), dtype=np.uint8)
+
+    # Дата "д/м/рррр" без провідних нулів і час "ГГ:ХХ:СС"
+    year, month, day = timestamps.civil_from_days(columns['minutes'] // timestamps.minutes_per_day)
+    minute_of_day = columns['minutes'] % timestamps.minutes_per_day
+    _put_digits(matrix, 0, day, 2)
+    matrix[:, 2] = ord('/')
+    _put_digits(matrix, 3, month, 2)
+    matrix[:, 5] = ord('/')
+    _put_digits(matrix, 6, year, 4, pad_leading=False)
+    matrix[:, 10] = ord(';')
+    _put_digits(matrix, 11, minute_of_day // 60, 2, pad_leading=False)
+    matrix[:, 13] = ord(':')
+    _put_digits(matrix, 14, minute_of_day % 60, 2, pad_leading=False)
+    matrix[:, 16:19] = np.frombuffer(b':00', dtype=np.uint8)
+
+    # Сім числових полів "ЦЦЦ.ддд;" (останнє поле закінчується переведенням рядка)
+    names = ['Global_active_power', 'Global_reactive_power', 'Voltage', 'Global_intensity',
+             'Sub_metering_1', 'Sub_metering_2', 'Sub_metering_3']
+    column = 19
+    for name in names:
+        matrix[:, column] = ord(';')
+        values = columns[name]
+        _put_digits(matrix, column + 1, values // 1000, 3)
+        matrix[:, column + 4] = ord('.')
+        _put_digits(matrix, column + 5, values % 1000, 3, pad_leading=False)
+        if missing.any():
+            # У пропущених рядках перші шість полів містять '?', а останнє порожнє
+            matrix[missing, column + 1:column + 8] = 0
+            if name != 'Sub_metering_3':
+                matrix[missing, column + 1] = ord('?')
+        column += 8
+    matrix[:, width - 1] = ord('\n')
+
+    return matrix[matrix != 0].tobytes()
+
+def generate_file(path, rows, seed=0, start=default_start, missing_rate=0.0125, verbose=True):
+    """Записує rows рядків синтетичних даних у файл формату UCI."""
+    year, month, day, minute = start
+    first_minute = int(timestamps.days_from_civil(np.int64(year), np.int64(month), np.int64(day))) \
+        * timestamps.minutes_per_day + minute
+
+    started = time.perf_counter()
+    with open(path, 'wb') as file:
+        file.write(header.encode('ascii'))
+        for block_index, offset in enumerate(range(0, rows, block_rows)):
+            count = min(block_rows, rows - offset)
+            columns, missing = generate_block(seed, block_index, first_minute + offset, count, missing_rate)
+            file.write(format_block(columns, missing))
+            if verbose and block_index % 40 == 39:
+                print(f"Записано {offset + count} з {rows} рядків...")
+
+    if verbose:
+        print(f"Файл {path}: {rows} рядків за {time.perf_counter() - started:.1f} с")
+    return path
+
+def main():
+    parser = argparse.ArgumentParser(description="Генерація синтетичного household_power_consumption.txt")
+    parser.add_argument('--rows', default='1M', help="кількість рядків, наприклад 1M, 10M, 100M")
+    parser.add_argument('--seed', type=int, default=0, help="зерно генератора")
+    parser.add_argument('--missing', type=float, default=0.0125, help="частка рядків з '?'")
+    parser.add_argument('--output', default='household_power_consumption.txt', help="шлях до файлу")
+    args = parser.parse_args()
+
+    generate_file(args.output, parse_rows(args.rows), seed=args.seed, missing_rate=args.missing)
+
+if __name__ == "__main__":
+    main()
@@ -4,7 +4,20 @@ import matplotlib.pyplot as plt
 import seaborn as sns
 from timeit import timeit
 import time
+import sys
+import os
+import shutil
 from scipy import stats
+import power_cache
+import timestamps
+import query
+from query import Query, col
+from parallel import PartitionedRunner
+import benchmark
+import generate_data
+import sampling
+from time_index import TimeIndex, to_minutes
+from rollups import RollupStore
 
 # Шлях до файлу з даними - змініть на свій локальний шлях
 file_path = "household_power_consumption.txt"
@@ -20,9 +33,11 @@ def print_timing_results(pandas_time, numpy_time, operation_name):
         print(f"NumPy швидший на {(pandas_time/numpy_time - 1)*100:.2f}%")
 
 # Завантаження даних з використанням Pandas
-def load_data_pandas():
+def load_data_pandas(compact=False, path=None):
     # Визначення типів даних для оптимізації пам'яті
     dtypes = {
+        'Date': 'str',
+        'Time': 'str',
         'Global_active_power': 'float64',
         'Global_reactive_power': 'float64',
         'Voltage': 'float64',
@@ -33,37 +48,244 @@ def load_data_pandas():
     }
     
     # Завантаження даних з визначенням роздільника та пропущених значень
-    df = pd.read_csv(file_path, sep=';', parse_dates={'datetime': ['Date', 'Time']},
-                    dayfirst=True, na_values=['?'], dtype=dtypes)
+    df = pd.read_csv(path or file_path, sep=';', na_values=['?'], dtype=dtypes)
     
     # Видалення рядків з пропущеними значеннями
     df = df.dropna()
     
+    # Векторизоване перетворення стовпців Date/Time на час у хвилинах
+    minutes, hours, weekdays = timestamps.decode_timestamps(df['Date'].to_numpy(), df['Time'].to_numpy())
+    df = df.drop(columns=['Date', 'Time'])
+    df.insert(0, 'datetime', minutes.astype('datetime64[m]').astype('datetime64[ns]'))
+    
     # Додавання окремих стовпців для дати і часу для зручності обробки
-    df['date'] = df['datetime'].dt.date
-    df['time'] = df['datetime'].dt.time
-    df['hour'] = df['datetime'].dt.hour
+    df['date'] = (minutes // timestamps.minutes_per_day).astype('datetime64[D]').astype('datetime64[s]')
+    df['time'] = pd.to_timedelta(minutes % timestamps.minutes_per_day, unit='m')
+    df['hour'] = hours
+    df['weekday'] = weekdays
+    
+    if compact:
+        df = to_compact_pandas(df)
     
     return df
 
+# Типи даних для структурованого масиву NumPy
+numpy_types = [("Date", "U10"), ("Time", "U8"), ("Global_active_power", "float64"),
+               ("Global_reactive_power", "float64"), ("Voltage", "float64"),
+               ("Global_intensity", "float64"), ("Sub_metering_1", "float64"),
+               ("Sub_metering_2", "float64"), ("Sub_metering_3", "float64")]
+
 # Завантаження даних з використанням NumPy
-def load_data_numpy():
+def load_data_numpy(compact=False, path=None):
     # Визначення типів даних
-    types = [("Date", "U10"), ("Time", "U8"), ("Global_active_power", "float64"),
-             ("Global_reactive_power", "float64"), ("Voltage", "float64"),
-             ("Global_intensity", "float64"), ("Sub_metering_1", "float64"),
-             ("Sub_metering_2", "float64"), ("Sub_metering_3", "float64")]
+    types = numpy_types
     
     # Завантаження даних
-    data = np.genfromtxt(file_path, missing_values=["?", np.nan],
+    data = np.genfromtxt(path or file_path, missing_values=["?", np.nan],
                          delimiter=';', dtype=types, encoding="UTF-8", names=True)
     
     # Видалення рядків з пропущеними значеннями
     mask = ~np.isnan(data["Global_active_power"])
     data = data[mask]
     
+    if compact:
+        data = to_compact_numpy(data)
+    
     return data
 
+# Компактна схема типів даних (вмикається параметром compact=True).
+# Значення потужності, вольтажу та сили струму мають 1-3 знаки після коми, тому float32
+# зберігає результати порівнянь з порогами завдань; лічильники споживання містять
+# цілі ват-години і зберігаються в найменшому беззнаковому цілому типі.
+compact_float_columns = ['Global_active_power', 'Global_reactive_power', 'Voltage', 'Global_intensity']
+compact_meter_columns = ['Sub_metering_1', 'Sub_metering_2', 'Sub_metering_3']
+
+def _compact_meter_dtype(values):
+    # Якщо значення не цілі або від'ємні, залишаємо float32
+    if len(values) == 0:
+        return np.dtype('uint8')
+    if values.min() < 0 or not np.all(values == np.round(values)):
+        return np.dtype('float32')
+    return np.min_scalar_type(int(values.max()))
+
+def to_compact_pandas(df):
+    before = memory_usage(df)
+    compact = pd.DataFrame(index=df.index)
+    
+    # Дата як кількість днів від 1970-01-01, час як хвилина доби
+    minutes = df['datetime'].to_numpy().astype('datetime64[m]').astype('int64')
+    compact['date'] = (minutes // timestamps.minutes_per_day).astype('int32')
+    compact['time'] = (minutes % timestamps.minutes_per_day).astype('int16')
+    
+    for name in compact_float_columns:
+        compact[name] = df[name].astype('float32')
+    for name in compact_meter_columns:
+        compact[name] = df[name].astype(_compact_meter_dtype(df[name].to_numpy()))
+    compact['hour'] = df['hour'].astype('uint8')
+    compact['weekday'] = df['weekday'].astype('uint8')
+    
+    print_memory_report(before, memory_usage(compact), "Pandas")
+    return compact
+
+def to_compact_numpy(data):
+    before = memory_usage(data)
+    
+    types = [("date", "int32"), ("time", "int16")]
+    types += [(name, "float32") for name in compact_float_columns]
+    types += [(name, _compact_meter_dtype(data[name]).str) for name in compact_meter_columns]
+    types += [("hour", "uint8")]
+    
+    compact = np.empty(len(data), dtype=types)
+    compact['date'] = timestamps.decode_dates(data['Date'])
+    compact['time'] = timestamps.decode_time_minutes(data['Time'])
+    for name in compact_float_columns + compact_meter_columns:
+        compact[name] = data[name]
+    compact['hour'] = compact['time'] // 60
+    
+    print_memory_report(before, memory_usage(compact), "NumPy")
+    return compact
+
+# Обсяг пам'яті, який займають дані (з урахуванням рядків Python у Pandas)
+def memory_usage(data):
+    if isinstance(data, pd.DataFrame):
+        return int(data.memory_usage(deep=True).sum())
+    return int(data.nbytes)
+
+def print_memory_report(before, after, name):
+    print(f"\n--- Пам'ять ({name}) ---")
+    print(f"До стиснення: {before / 2**20:.2f} МБ")
+    print(f"Після стиснення: {after / 2**20:.2f} МБ")
+    if after:
+        print(f"Зменшення у {before / after:.2f} рази")
+
+# Перевірка, що компактна схема не змінює результати завдань
+def compare_task_results(tasks, data, compact_data, seed=0):
+    identical = True
+    for i, task in enumerate(tasks, 1):
+        np.random.seed(seed)
+        result = task(data)
+        np.random.seed(seed)
+        compact_result = task(compact_data)
+        
+        if isinstance(result, dict):
+            same = all(result[key] == compact_result[key] for key in result)
+        else:
+            columns = compact_float_columns + compact_meter_columns
+            same = len(result) == len(compact_result) and all(
+                np.array_equal(np.asarray(result[name], dtype='float32'),
+                               np.asarray(compact_result[name], dtype='float32'))
+                for name in columns)
+        
+        print(f"Завдання {i}: {'результати збігаються' if same else 'РЕЗУЛЬТАТИ ВІДРІЗНЯЮТЬСЯ'}")
+        identical = identical and same
+    return identical
+
+# Завантаження даних з колонкового кешу (.npy файли поруч з вихідним файлом).
+# Кеш створюється під час першого запуску і перебудовується, якщо файл змінився.
+def load_data_pandas_cached(path=None):
+    columns = power_cache.load_columns(path or file_path)
+    
+    df = pd.DataFrame({name: columns[name] for name in power_cache.measurement_columns})
+    df.insert(0, 'datetime', columns['datetime'].astype('datetime64[m]').astype('datetime64[ns]'))
+    df['hour'] = timestamps.hour_of(columns['datetime'])
+    df['weekday'] = timestamps.weekday_of(columns['datetime'])
+    
+    return df
+
+# Типи даних для структурованого масиву, отриманого з кешу
+cached_numpy_types = [("datetime", "int64")] + numpy_types[2:] + [("hour", "uint8"), ("weekday", "uint8")]
+
+def load_data_numpy_cached(path=None):
+    columns = power_cache.load_columns(path or file_path)
+    
+    data = np.empty(len(columns['datetime']), dtype=cached_numpy_types)
+    for name in power_cache.cache_columns:
+        data[name] = columns[name]
+    data['hour'] = timestamps.hour_of(columns['datetime'])
+    data['weekday'] = timestamps.weekday_of(columns['datetime'])
+    
+    return data
+
+# Погодинні, денні та місячні агрегати (rollups.RollupStore) зберігаються в папці кешу.
+# Якщо до кешу лише дописано нові рядки, агрегати оновлюються тільки ними,
+# якщо кеш перебудовано - агрегати будуються заново
+def load_rollups():
+    columns = power_cache.load_columns(file_path)
+    cache_dir = power_cache.cache_dir_for(file_path)
+    manifest = power_cache.read_manifest(cache_dir)
+    
+    store, meta = RollupStore.load(cache_dir)
+    if store is not None and meta.get('build_id') == manifest['build_id'] and meta['rows'] <= manifest['rows']:
+        if meta['rows'] == manifest['rows']:
+            return store
+        tail = slice(meta['rows'], manifest['rows'])
+        store.update(columns['datetime'][tail], {name: columns[name][tail] for name in store.columns})
+    else:
+        store = RollupStore.build(columns['datetime'], columns, power_cache.measurement_columns)
+    
+    store.save(cache_dir, build_id=manifest['build_id'], rows=manifest['rows'])
+    return store
+
+# Оновлення даних для файлу, який постійно дописується: у кеш додаються лише нові
+# рядки, агрегати та індекс за часом оновлюються лише ними
+def refresh_data(index=None):
+    manifest_before = power_cache.read_manifest(power_cache.cache_dir_for(file_path))
+    columns = power_cache.load_columns(file_path)
+    store = load_rollups()
+    
+    rebuilt = manifest_before is None or \
+        manifest_before['build_id'] != power_cache.read_manifest(power_cache.cache_dir_for(file_path))['build_id']
+    if index is None or rebuilt or len(index) > len(columns['datetime']):
+        index = TimeIndex(columns['datetime'])
+    else:
+        index.extend(columns['datetime'][len(index):])
+    
+    return columns, store, index
+
+# Агрегат стовпця за період [start, end): відповідь береться з найгрубшого рівня агрегатів,
+# межі якого збігаються з періодом, інакше рахується з хвилинних даних
+def aggregate(column, stat, start=None, end=None, store=None):
+    store = store or load_rollups()
+    start = None if start is None else to_minutes(start)
+    end = None if end is None else to_minutes(end)
+    
+    result = store.aggregate(column, stat, start, end)
+    if result is not None:
+        return result
+    
+    columns = power_cache.load_columns(file_path)
+    minutes = columns['datetime']
+    lo = 0 if start is None else np.searchsorted(minutes, start)
+    hi = len(minutes) if end is None else np.searchsorted(minutes, end)
+    values = np.asarray(columns[column][lo:hi])
+    if stat == 'count':
+        return len(values)
+    return float(getattr(np, stat)(values)) if len(values) else np.nan
+
+# Потокове завантаження даних частинами фіксованого розміру.
+# Повертає генератор структурованих масивів з тими ж типами, що й load_data_numpy,
+# тому в пам'яті одночасно знаходиться лише одна частина файлу.
+chunk_size = 200000
+
+def iter_data_chunks(path=None, size=None):
+    path = path or file_path
+    size = size or chunk_size
+    dtypes = {name: dtype for name, dtype in numpy_types[2:]}
+    dtypes.update({'Date': 'str', 'Time': 'str'})
+    
+    reader = pd.read_csv(path, sep=';', na_values=['?'], dtype=dtypes,
+                         chunksize=size, engine='c')
+    for chunk in reader:
+        # Видалення рядків з пропущеними значеннями
+        chunk = chunk[chunk['Global_active_power'].notna()]
+        if chunk.empty:
+            continue
+        
+        batch = np.empty(len(chunk), dtype=numpy_types)
+        for name in batch.dtype.names:
+            batch[name] = chunk[name].to_numpy()
+        yield batch
+
 # Завдання 1: Обрати всі записи, у яких загальна активна споживана потужність перевищує 5 кВт
 def task1_pandas(df):
     result = df[df['Global_active_power'] > 5]
@@ -178,8 +400,17 @@ def task5_pandas(df):
     return result
 
 def task5_numpy(data):
-    # Витягаємо години з часу (припустимо, що час у форматі "HH:MM:SS")
-    hours = np.array([int(time.split(':')[0]) for time in data['Time']])
+    group2_highest = task5_numpy_filter(data)
+    return task5_numpy_select(group2_highest)
+
+# Перший етап завдання 5: вечірні записи, де група 2 споживає найбільше
+def task5_numpy_filter(data):
+    # Витягаємо години з часу (припустимо, що час у форматі "HH:MM:SS");
+    # дані з кешу вже містять стовпець з годиною
+    if 'hour' in data.dtype.names:
+        hours = data['hour']
+    else:
+        hours = timestamps.decode_hours(data['Time'])
     
     # Фільтруємо записи після 18:00 з споживанням більше 6 кВт
     evening_mask = (hours >= 18) & (data['Global_active_power'] > 6)
@@ -189,7 +420,10 @@ def task5_numpy(data):
     group2_mask = (evening_high_consumption['Sub_metering_2'] > evening_high_consumption['Sub_metering_1']) & \
                   (evening_high_consumption['Sub_metering_2'] > evening_high_consumption['Sub_metering_3'])
     group2_highest = evening_high_consumption[group2_mask]
-    
+    return group2_highest
+
+# Другий етап завдання 5: прорідження першої та другої половини результатів
+def task5_numpy_select(group2_highest):
     # Розділяємо на дві половини
     half_point = len(group2_highest) // 2
     first_half = group2_highest[:half_point]
@@ -206,67 +440,231 @@ def task5_numpy(data):
     
     return result
 
+# Версії завдань на основі злитих умов (query.Query): усі умови завдання
+# записуються в одну маску, а рядки вибираються лише один раз.
+# Працюють як зі структурованими масивами NumPy, так і з DataFrame.
+# Завдання 1 і 2 мають одну умову, тому їхні злиті версії нічим не відрізнялися б
+# від task1_numpy і task2_numpy; запити task1_query і task2_query використовуються
+# для паралельного виконання.
+task1_query = Query(('Global_active_power', '>', 5))
+task2_query = Query(('Voltage', '>', 235))
+task3_query = Query(('Global_intensity', '>=', 19), ('Global_intensity', '<=', 20),
+                    ('Sub_metering_2', '>', col('Sub_metering_3')))
+# Умова за потужністю відкидає майже всі рядки, тому перевіряється першою
+task5_query = Query(('Global_active_power', '>', 6), ('hour', '>=', 18),
+                    ('Sub_metering_2', '>', col('Sub_metering_1')),
+                    ('Sub_metering_2', '>', col('Sub_metering_3')))
+
+# Стовпець з годиною для даних, які містять лише рядки Time
+def _hour_columns(data):
+    if isinstance(data, pd.DataFrame) or 'hour' in data.dtype.names:
+        return None
+    return {'hour': timestamps.decode_hours(data['Time'])}
+
+def task3_fused(data):
+    return task3_query.select(data)
+
+def task4_fused(data, sample_size=500000, seed=None):
+    # Вибираються лише індекси, а середні рахуються по трьох потрібних стовпцях
+    sample, _ = sampling.sample_columns(data, sample_size, seed=seed)
+    return sampling.means_dict(sample)
+
+def task5_fused(data):
+    # Прорідження виконується над масивом індексів, рядки вибираються один раз
+    indices = task5_query.indices(data, _hour_columns(data))
+    return query.take_rows(data, task5_numpy_select(indices))
+
+# Індекс за часом (time_index.TimeIndex) для завантажених даних будь-якого формату
+def data_minutes(data):
+    if isinstance(data, pd.DataFrame):
+        if 'datetime' in data.columns:
+            return data['datetime'].to_numpy().astype('datetime64[m]').astype('int64')
+        return data['date'].to_numpy(dtype='int64') * timestamps.minutes_per_day + data['time'].to_numpy(dtype='int64')
+    if 'datetime' in data.dtype.names:
+        return data['datetime']
+    if 'date' in data.dtype.names:
+        return data['date'].astype('int64') * timestamps.minutes_per_day + data['time']
+    return timestamps.decode_timestamps(data['Date'], data['Time'])[0]
+
+def build_time_index(data):
+    return TimeIndex(data_minutes(data))
+
+# Записи за діапазоном дат [start, end), наприклад select_period(data, index, '2007-01-01', '2007-02-01')
+def select_period(data, index, start=None, end=None):
+    return query.take_rows(data, index.date_range(start, end))
+
+# Завдання 5 з індексом: рядки після 18:00 визначаються таблицею годин,
+# а решта умов перевіряється лише для них
+task5_rest_query = Query(('Global_active_power', '>', 6),
+                         ('Sub_metering_2', '>', col('Sub_metering_1')),
+                         ('Sub_metering_2', '>', col('Sub_metering_3')))
+
+def task5_indexed(data, index):
+    evening = index.hour_range(18)
+    columns = {name: query.get_column(data, name)[evening]
+               for name in ['Global_active_power', 'Sub_metering_1', 'Sub_metering_2', 'Sub_metering_3']}
+    rows = evening[task5_rest_query.indices(columns)]
+    return query.take_rows(data, task5_numpy_select(rows))
+
+# Потокові версії завдань: кожна частина обробляється окремо, а відібрані
+# записи повертаються генератором по частинах, тому в пам'яті одночасно
+# знаходиться лише одна частина файлу та її результат
+def task1_streaming(chunks):
+    return (task1_numpy(chunk) for chunk in chunks)
+
+def task2_streaming(chunks):
+    return (task2_numpy(chunk) for chunk in chunks)
+
+def task3_streaming(chunks):
+    return (task3_numpy(chunk) for chunk in chunks)
+
+def task4_streaming(chunks, sample_size=500000, seed=None):
+    # Резервуарна вибірка за один прохід: у пам'яті зберігаються лише
+    # 500000 значень трьох стовпців споживання
+    sampler = sampling.ReservoirSampler(sample_size, seed=seed)
+    for chunk in chunks:
+        sampler.update(chunk)
+    return sampling.means_dict(sampler.sample())
+
+def task5_streaming(read_chunks):
+    # Прорідження залежить від загальної кількості відібраних записів, тому
+    # файл читається двічі (read_chunks повертає нову послідовність частин):
+    # перший прохід лише рахує записи, другий повертає вибрані записи по частинах
+    total = sum(len(task5_numpy_filter(chunk)) for chunk in read_chunks())
+    half_point = total // 2
+    position = 0
+    for chunk in read_chunks():
+        group2_highest = task5_numpy_filter(chunk)
+        # Номери записів частини серед усіх відібраних записів
+        numbers = np.arange(position, position + len(group2_highest))
+        position += len(group2_highest)
+        selected = np.where(numbers < half_point, numbers % 3 == 0, (numbers - half_point) % 4 == 0)
+        if selected.any():
+            yield group2_highest[selected]
+
+# Кількість записів у результаті, що повертається по частинах
+def count_batches(batches):
+    return sum(len(batch) for batch in batches)
+
+# Налаштування вимірювань (див. модуль benchmark)
+benchmark_repeats = 5
+benchmark_warmup = 1
+results_path = 'benchmark_results.json'
+baseline_path = 'benchmark_baseline.json'
+regression_threshold = 0.10
+
 # Функції для виконання і профілювання всіх завдань
 def run_all_tasks_pandas(df):
-    results = {}
-    
-    task1_time = timeit(lambda: task1_pandas(df), number=5) / 5
-    results['task1'] = {'time': task1_time, 'result_len': len(task1_pandas(df))}
-    
-    task2_time = timeit(lambda: task2_pandas(df), number=5) / 5
-    results['task2'] = {'time': task2_time, 'result_len': len(task2_pandas(df))}
-    
-    task3_time = timeit(lambda: task3_pandas(df), number=5) / 5
-    results['task3'] = {'time': task3_time, 'result_len': len(task3_pandas(df))}
-    
-    task4_time = timeit(lambda: task4_pandas(df), number=5) / 5
-    results['task4'] = {'time': task4_time, 'result': task4_pandas(df)}
-    
-    task5_time = timeit(lambda: task5_pandas(df), number=5) / 5
-    try:
-        results['task5'] = {'time': task5_time, 'result_len': len(task5_pandas(df))}
-    except Exception as e:
-        results['task5'] = {'time': task5_time, 'error': str(e)}
-    
-    return results
+    tasks = [task1_pandas, task2_pandas, task3_pandas, task4_pandas, task5_pandas]
+    return benchmark.run_suite({f'task{i}': (lambda task=task: task(df)) for i, task in enumerate(tasks, 1)},
+                               repeats=benchmark_repeats, warmup=benchmark_warmup)
 
 def run_all_tasks_numpy(data):
-    results = {}
-    
-    task1_time = timeit(lambda: task1_numpy(data), number=5) / 5
-    results['task1'] = {'time': task1_time, 'result_len': len(task1_numpy(data))}
-    
-    task2_time = timeit(lambda: task2_numpy(data), number=5) / 5
-    results['task2'] = {'time': task2_time, 'result_len': len(task2_numpy(data))}
-    
-    task3_time = timeit(lambda: task3_numpy(data), number=5) / 5
-    results['task3'] = {'time': task3_time, 'result_len': len(task3_numpy(data))}
-    
-    task4_time = timeit(lambda: task4_numpy(data), number=5) / 5
-    results['task4'] = {'time': task4_time, 'result': task4_numpy(data)}
-    
-    task5_time = timeit(lambda: task5_numpy(data), number=5) / 5
-    try:
-        results['task5'] = {'time': task5_time, 'result_len': len(task5_numpy(data))}
-    except Exception as e:
-        results['task5'] = {'time': task5_time, 'error': str(e)}
-    
-    return results
+    tasks = [task1_numpy, task2_numpy, task3_numpy, task4_numpy, task5_numpy]
+    return benchmark.run_suite({f'task{i}': (lambda task=task: task(data)) for i, task in enumerate(tasks, 1)},
+                               repeats=benchmark_repeats, warmup=benchmark_warmup)
+
+# Злиті версії є лише для завдань з кількома умовами (3, 5) і для завдання 4
+fused_tasks = {'task3': task3_fused, 'task4': task4_fused, 'task5': task5_fused}
+
+def run_all_tasks_fused(data):
+    return benchmark.run_suite({name: (lambda task=task: task(data)) for name, task in fused_tasks.items()},
+                               repeats=benchmark_repeats, warmup=benchmark_warmup)
+
+# Паралельне виконання завдань над частинами рядків у пулі процесів.
+# Фільтри повертають індекси частин у глобальному порядку, тому прорідження
+# завдання 5 виконується над об'єднаним результатом так само, як у task5_numpy.
+parallel_columns = ['Global_active_power', 'Voltage', 'Global_intensity',
+                    'Sub_metering_1', 'Sub_metering_2', 'Sub_metering_3', 'hour']
+
+def run_all_tasks_parallel(data, workers=None):
+    meters = ['Sub_metering_1', 'Sub_metering_2', 'Sub_metering_3']
+    
+    with PartitionedRunner(data, parallel_columns, workers=workers, extra=_hour_columns(data)) as runner:
+        tasks = {
+            'task1': lambda: query.take_rows(data, runner.filter_indices(task1_query)),
+            'task2': lambda: query.take_rows(data, runner.filter_indices(task2_query)),
+            'task3': lambda: query.take_rows(data, runner.filter_indices(task3_query)),
+            'task4': lambda: runner.sampled_means(sampling.sample_indices(len(data), 500000), meters),
+            'task5': lambda: query.take_rows(data, task5_numpy_select(runner.filter_indices(task5_query))),
+        }
+        # Виділення пам'яті у процесах пулу tracemalloc не бачить, тому не вимірюються
+        return benchmark.run_suite(tasks, repeats=benchmark_repeats, warmup=benchmark_warmup, allocations=False)
+
+def run_all_tasks_streaming(path=None, size=None):
+    read_chunks = lambda: iter_data_chunks(path, size)
+    
+    # Відібрані записи лише підраховуються по частинах і не накопичуються в пам'яті.
+    # Кожне завдання читає файл заново, тому виконується один раз
+    tasks = {
+        'task1': lambda: {'rows': count_batches(task1_streaming(read_chunks()))},
+        'task2': lambda: {'rows': count_batches(task2_streaming(read_chunks()))},
+        'task3': lambda: {'rows': count_batches(task3_streaming(read_chunks()))},
+        'task4': lambda: task4_streaming(read_chunks()),
+        'task5': lambda: {'rows': count_batches(task5_streaming(read_chunks))},
+    }
+    return benchmark.run_suite(tasks, repeats=1, warmup=0, allocations=False)
 
-# Візуалізація результатів порівняння часу виконання
-def plot_timing_comparison(pandas_results, numpy_results):
-    tasks = list(pandas_results.keys())
-    pandas_times = [pandas_results[task]['time'] for task in tasks]
-    numpy_times = [numpy_results[task]['time'] for task in tasks]
+# Вимірювання масштабованості на синтетичних даних різного розміру (generate_data.py)
+scaling_sizes = ['100k', '1M', '10M']
+scaling_dir = 'synthetic'
+scaling_results_path = 'benchmark_scaling.json'
+
+def run_scaling_benchmark(sizes=None, seed=0):
+    sizes = sizes or scaling_sizes
+    os.makedirs(scaling_dir, exist_ok=True)
+    suites = {}
+    
+    # Шлях до синтетичного файлу передається завантажувачам явно, file_path не змінюється
+    for size in sizes:
+        rows = generate_data.parse_rows(size)
+        path = os.path.join(scaling_dir, f'synthetic_{rows}_{seed}.txt')
+        if not os.path.exists(path):
+            generate_data.generate_file(path, rows, seed=seed)
+        
+        # Завантаження з тексту виконується один раз, бо займає найбільше часу
+        print(f"\nВимірювання для {rows} рядків...")
+        results = benchmark.run_suite({'load_pandas': lambda: load_data_pandas(path=path),
+                                       'load_cache_build': lambda: power_cache.build_cache(path)},
+                                      repeats=1, warmup=0, allocations=False)
+        
+        data = load_data_numpy_cached(path)
+        tasks = {'load_cached': lambda: load_data_numpy_cached(path)}
+        tasks.update({name: (lambda task=task: task(data)) for name, task in fused_tasks.items()})
+        results.update(benchmark.run_suite(tasks, repeats=benchmark_repeats, warmup=benchmark_warmup,
+                                           allocations=False))
+        suites[str(rows)] = results
+    
+    benchmark.save_results(suites, scaling_results_path, seed=seed)
+    
+    # Таблиця: медіанний час кожної операції для кожного розміру даних
+    names = list(next(iter(suites.values())).keys())
+    print(f"\n{'Рядків':>12}" + ''.join(f"{name:>18}" for name in names))
+    for rows, results in suites.items():
+        print(f"{rows:>12}" + ''.join(f"{results[name]['median']:>18.4f}" for name in names))
+    return suites
+
+# Назви наборів вимірювань для графіка
+suite_labels = {'pandas': 'Pandas', 'numpy': 'NumPy', 'fused': 'Злиті умови', 'parallel': 'Паралельно'}
+
+# Візуалізація результатів порівняння часу виконання (зі збереженого JSON)
+def plot_timing_comparison(path=results_path, suites=None):
+    document = benchmark.load_results(path)
+    suites = suites or list(document['suites'].keys())
+    tasks = list(document['suites'][suites[0]].keys())
     
     x = np.arange(len(tasks))
-    width = 0.35
+    width = 0.8 / len(suites)
     
     fig, ax = plt.subplots(figsize=(12, 6))
-    rects1 = ax.bar(x - width/2, pandas_times, width, label='Pandas')
-    rects2 = ax.bar(x + width/2, numpy_times, width, label='NumPy')
-    
-    ax.set_ylabel('Час виконання (секунди)')
+    for i, suite in enumerate(suites):
+        results = document['suites'][suite]
+        medians = [results[task]['median'] for task in tasks]
+        errors = [results[task]['stddev'] for task in tasks]
+        ax.bar(x - 0.4 + width * (i + 0.5), medians, width, yerr=errors, capsize=3,
+               label=suite_labels.get(suite, suite))
+    
+    ax.set_ylabel('Медіанний час виконання (секунди)')
     ax.set_title('Порівняння часу виконання завдань')
     ax.set_xticks(x)
     ax.set_xticklabels([f'Завдання {i+1}' for i in range(len(tasks))])
@@ -288,6 +686,21 @@ def main():
     
     print_timing_results(pandas_load_time, numpy_load_time, "Завантаження даних")
     
+    # Перший виклик будує кеш, повторні лише відображають .npy файли у пам'ять
+    print("\nЗавантаження даних з колонкового кешу...")
+    power_cache.load_columns(file_path)
+    pandas_cached_time = timeit(load_data_pandas_cached, number=1)
+    numpy_cached_time = timeit(load_data_numpy_cached, number=1)
+    print_timing_results(pandas_cached_time, numpy_cached_time, "Завантаження даних з кешу")
+    
+    # Компактна схема типів даних: звіт про пам'ять і перевірка результатів
+    df_compact = to_compact_pandas(df)
+    data_compact = to_compact_numpy(data)
+    print("\nПеревірка результатів для компактної схеми (Pandas):")
+    compare_task_results([task1_pandas, task2_pandas, task3_pandas, task4_pandas, task5_pandas], df, df_compact)
+    print("\nПеревірка результатів для компактної схеми (NumPy):")
+    compare_task_results([task1_numpy, task2_numpy, task3_numpy, task4_numpy, task5_numpy], data, data_compact)
+    
     print("\nВиконання завдань з використанням Pandas...")
     pandas_results = run_all_tasks_pandas(df)
     
@@ -304,8 +717,64 @@ def main():
         if 'error' in numpy_results[task]:
             print(f"Помилка при виконанні з NumPy: {numpy_results[task]['error']}")
     
+    # Завдання з одним злитим проходом умов над даними NumPy
+    print("\nВиконання завдань зі злитими умовами (один прохід)...")
+    fused_results = run_all_tasks_fused(data)
+    for task in fused_results:
+        print(f"Завдання {task[4:]}: NumPy {numpy_results[task]['time']:.6f} с, "
+              f"злиті умови {fused_results[task]['time']:.6f} с, "
+              f"розмір результату: {fused_results[task].get('result_len', '-')}")
+    
+    # Завдання 5 з індексом за часом (без перегляду всіх рядків за годиною)
+    index_build_time = timeit(lambda: build_time_index(data), number=1)
+    index = build_time_index(data)
+    indexed_results = benchmark.run_suite({'task5': lambda: task5_indexed(data, index)},
+                                          repeats=benchmark_repeats, warmup=benchmark_warmup)
+    print(f"\nПобудова індексу за часом: {index_build_time:.6f} с")
+    print(f"Завдання 5: NumPy {numpy_results['task5']['time']:.6f} с, "
+          f"з індексом {indexed_results['task5']['time']:.6f} с, "
+          f"розмір результату: {indexed_results['task5'].get('result_len', '-')}")
+    
+    # Агрегати за період з готових погодинних/денних/місячних агрегатів
+    store = load_rollups()
+    months, monthly_power = store.series('month', 'Global_active_power', 'mean')
+    rollup_time = timeit(lambda: aggregate('Global_active_power', 'mean', store=store), number=5) / 5
+    print(f"\nСередня активна потужність за весь період (з агрегатів, {rollup_time:.6f} с): "
+          f"{aggregate('Global_active_power', 'mean', store=store):.4f} кВт")
+    print(f"Кількість місяців у місячних агрегатах: {len(months)}")
+    
+    # Довірчі інтервали середніх для вибірки завдання 4
+    sample, population = sampling.sample_columns(data, 500000)
+    print("\nДовірчі інтервали (95%) для середніх завдання 4:")
+    for name, interval in sampling.confidence_intervals(sample, population).items():
+        print(f"{name}: {interval['mean']:.4f} [{interval['low']:.4f}; {interval['high']:.4f}]")
+    
+    # Паралельне виконання над частинами рядків
+    print(f"\nПаралельне виконання завдань ({os.cpu_count()} процесів)...")
+    parallel_results = run_all_tasks_parallel(data)
+    for i, task in enumerate(parallel_results.keys(), 1):
+        print(f"Завдання {i}: NumPy {numpy_results[task]['time']:.6f} с, "
+              f"паралельно {parallel_results[task]['time']:.6f} с, "
+              f"розмір результату: {parallel_results[task].get('result_len', '-')}")
+    
+    # Детальна статистика, збереження результатів і порівняння з базовими
+    suites = {'pandas': pandas_results, 'numpy': numpy_results,
+              'fused': fused_results, 'parallel': parallel_results}
+    for name, results in suites.items():
+        benchmark.print_suite(suite_labels[name], results)
+    
+    document = benchmark.save_results(suites, results_path, rows=len(data),
+                                      repeats=benchmark_repeats, warmup=benchmark_warmup)
+    if "--save-baseline" in sys.argv:
+        shutil.copyfile(results_path, baseline_path)
+        print(f"\nБазові результати збережено у {baseline_path}")
+    elif os.path.exists(baseline_path):
+        regressions = benchmark.compare_results(document, benchmark.load_results(baseline_path),
+                                                regression_threshold)
+        benchmark.print_regressions(regressions, regression_threshold)
+    
     # Візуалізація порівняння часу виконання
-    plot_timing_comparison(pandas_results, numpy_results)
+    plot_timing_comparison(results_path, ['pandas', 'numpy'])
     
     # Оцінка зручності виконання операцій
     print("\n--- Оцінка зручності виконання операцій (за 5-бальною шкалою) ---")
@@ -330,5 +799,25 @@ def main():
     print("4. Pandas краще підходить для аналізу даних, візуалізації та коли потрібні складні індексування і агрегації.")
     print("5. Вибір структури даних залежить від конкретної задачі та розміру набору даних.")
 
+# Виконання завдань у потоковому режимі для файлів, більших за оперативну пам'ять
+def main_streaming():
+    print(f"Потокове виконання завдань частинами по {chunk_size} рядків...")
+    results = run_all_tasks_streaming()
+    
+    for i, task in enumerate(results.keys(), 1):
+        print(f"\n--- Завдання {i} ---")
+        print(f"Час виконання: {results[task]['time']:.6f} секунд")
+        if 'error' in results[task]:
+            print(f"Помилка: {results[task]['error']}")
+        elif 'rows' in results[task]['result']:
+            print(f"Розмір результату: {int(results[task]['result']['rows'])}")
+        else:
+            print(f"Результат: {results[task]['result']}")
+
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    if "--stream" in sys.argv:
+        main_streaming()
+    elif "--scaling" in sys.argv:
+        run_scaling_benchmark()
+    else:
+        main()
\ No newline at end of file
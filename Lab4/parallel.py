@@ -0,0 +1,98 @@
+import os
+import numpy as np
+from multiprocessing import shared_memory
+from concurrent.futures import ProcessPoolExecutor
+
+import query
+
+# Приєднані блоки спільної пам'яті у процесі-виконавці (щоб не відкривати їх повторно)
+_attached = {}
+
+def _attach(spec):
+    """Повертає стовпці зі спільної пам'яті як масиви NumPy без копіювання."""
+    columns = {}
+    for name, (shm_name, dtype, length) in spec.items():
+        if shm_name not in _attached:
+            _attached[shm_name] = shared_memory.SharedMemory(name=shm_name)
+        columns[name] = np.ndarray(length, dtype=dtype, buffer=_attached[shm_name].buf)
+    return columns
+
+def _filter_partition(spec, start, stop, partition_query):
+    """Виконує запит над частиною рядків і повертає глобальні індекси."""
+    columns = {name: values[start:stop] for name, values in _attach(spec).items()}
+    return partition_query.indices(columns) + start
+
+def _sum_partition(spec, indices, names):
+    """Повертає суми стовпців і кількість рядків для вибраних індексів."""
+    columns = _attach(spec)
+    sums = {name: float(np.sum(columns[name][indices], dtype=np.float64)) for name in names}
+    return sums, len(indices)
+
+class PartitionedRunner:
+    """Виконує фільтри та агрегати над частинами рядків у пулі процесів.
+
+    Потрібні стовпці копіюються у спільну пам'ять один раз; кожен процес
+    отримує лише межі своєї частини. Результати частин об'єднуються у
+    порядку розбиття, тому глобальний порядок рядків зберігається.
+    """
+
+    def __init__(self, data, columns, workers=None, partitions=None, extra=None):
+        self.workers = workers or os.cpu_count() or 1
+        self.rows = query.row_count(data)
+        partitions = partitions or self.workers
+        self.bounds = np.linspace(0, self.rows, partitions + 1).astype(np.int64)
+
+        self._blocks = []
+        self.spec = {}
+        for name in columns:
+            values = np.ascontiguousarray(query.get_column(data, name, extra))
+            block = shared_memory.SharedMemory(create=True, size=max(values.nbytes, 1))
+            np.ndarray(len(values), dtype=values.dtype, buffer=block.buf)[:] = values
+            self._blocks.append(block)
+            self.spec[name] = (block.name, values.dtype.str, len(values))
+
+        self.pool = ProcessPoolExecutor(max_workers=self.workers)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        """Зупиняє пул процесів і звільняє спільну пам'ять."""
+        self.pool.shutdown()
+        for block in self._blocks:
+            block.close()
+            block.unlink()
+        self._blocks = []
+
+    def _partitions(self):
+        return list(zip(self.bounds[:-1], self.bounds[1:]))
+
+    def filter_indices(self, partition_query):
+        """Повертає індекси рядків, які задовольняють запит, у глобальному порядку."""
+        futures = [self.pool.submit(_filter_partition, self.spec, start, stop, partition_query)
+                   for start, stop in self._partitions()]
+        parts = [future.result() for future in futures]
+        return np.concatenate(parts) if parts else np.empty(0, dtype=np.intp)
+
+    def sampled_means(self, indices, names):
+        """Точні середні значення стовпців для заданих індексів.
+
+        Індекси розподіляються між частинами, кожна частина повертає суми
+        та кількість рядків, а середнє обчислюється з об'єднаних сум.
+        """
+        indices = np.sort(indices)
+        cuts = np.searchsorted(indices, self.bounds)
+        futures = [self.pool.submit(_sum_partition, self.spec, indices[cuts[i]:cuts[i + 1]], names)
+                   for i in range(len(cuts) - 1)]
+
+        totals = {name: 0.0 for name in names}
+        count = 0
+        for future in futures:
+            sums, rows = future.result()
+            for name in names:
+                totals[name] += sums[name]
+            count += rows
+        return {f'{name}_mean': totals[name] / count if count else np.nan for name in names}
@@ -0,0 +1,302 @@
+import os
+import io
+import json
+import uuid
+import hashlib
+import numpy as np
+import pandas as pd
+import timestamps
+
+# Версія формату кешу: при зміні структури кеш перебудовується автоматично
+cache_version = 3
+
+# Стовпці вимірювань у вихідному файлі
+measurement_columns = ['Global_active_power', 'Global_reactive_power', 'Voltage',
+                       'Global_intensity', 'Sub_metering_1', 'Sub_metering_2',
+                       'Sub_metering_3']
+
+# Стовпці кешу: час у хвилинах від 1970-01-01 та вимірювання
+cache_columns = {'datetime': 'int64'}
+cache_columns.update({name: 'float64' for name in measurement_columns})
+
+# Обсяг байтів перед позицією дочитування, за яким перевіряється, що файл лише дописувався
+fingerprint_bytes = 1 << 16
+
+def cache_dir_for(path):
+    """Повертає шлях до папки кешу поруч із вихідним файлом."""
+    return path + '.cache'
+
+def extend_hash(path, digest, start, stop, block_size=1 << 20):
+    """Продовжує ланцюжок хешів байтами [start, stop) файлу.
+
+    Новий хеш - SHA-256 від попереднього хешу і байтів відрізка, тому після
+    дописування досить прочитати лише новий відрізок.
+    """
+    chained = hashlib.sha256(digest.encode())
+    with open(path, 'rb') as file:
+        file.seek(start)
+        remaining = stop - start
+        while remaining > 0:
+            block = file.read(min(block_size, remaining))
+            if not block:
+                break
+            chained.update(block)
+            remaining -= len(block)
+    return chained.hexdigest()
+
+def prefix_hash(path, segments):
+    """Ланцюжок хешів файлу за межами відрізків (позиції кінців відрізків)."""
+    digest, start = '', 0
+    for stop in segments:
+        digest = extend_hash(path, digest, start, stop)
+        start = stop
+    return digest
+
+def source_signature(path):
+    """Повертає розмір і час зміни вихідного файлу."""
+    stat = os.stat(path)
+    return {'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns}
+
+def read_manifest(cache_dir):
+    """Читає маніфест кешу або повертає None, якщо його немає."""
+    manifest_path = os.path.join(cache_dir, 'manifest.json')
+    if not os.path.exists(manifest_path):
+        return None
+    with open(manifest_path, encoding='utf-8') as file:
+        return json.load(file)
+
+def write_manifest(cache_dir, manifest):
+    """Атомарно записує маніфест кешу."""
+    manifest_path = os.path.join(cache_dir, 'manifest.json')
+    tmp_path = manifest_path + '.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as file:
+        json.dump(manifest, file, indent=2)
+    os.replace(tmp_path, manifest_path)
+
+def is_cache_valid(path, cache_dir):
+    """Перевіряє, чи відповідає кеш поточному вмісту вихідного файлу."""
+    manifest = read_manifest(cache_dir)
+    if manifest is None or manifest.get('version') != cache_version:
+        return False
+
+    # Швидка перевірка за розміром і часом зміни
+    signature = source_signature(path)
+    cached = manifest['source']
+    if signature['size'] != cached['size']:
+        return False
+    if signature['mtime_ns'] == cached['mtime_ns']:
+        return True
+
+    # Час зміни інший (наприклад, файл скопійовано або змінено на місці) -
+    # порівнюємо хеш уже прочитаних байтів
+    if prefix_hash(path, manifest['segments']) != manifest['prefix_sha256']:
+        return False
+    cached['mtime_ns'] = signature['mtime_ns']
+    write_manifest(cache_dir, manifest)
+    return True
+
+class _RangeReader(io.RawIOBase):
+    """Файл, обмежений діапазоном байтів [start, stop), для pandas.read_csv."""
+
+    def __init__(self, path, start, stop):
+        self.file = open(path, 'rb')
+        self.file.seek(start)
+        self.remaining = stop - start
+
+    def readable(self):
+        return True
+
+    def readinto(self, buffer):
+        size = min(len(buffer), self.remaining)
+        if size <= 0:
+            return 0
+        data = self.file.read(size)
+        buffer[:len(data)] = data
+        self.remaining -= len(data)
+        return len(data)
+
+    def close(self):
+        self.file.close()
+        super().close()
+
+def complete_lines_end(path):
+    """Позиція після останнього символу нового рядка (неповний останній рядок не читається)."""
+    size = os.path.getsize(path)
+    with open(path, 'rb') as file:
+        position = size
+        while position > 0:
+            start = max(0, position - fingerprint_bytes)
+            file.seek(start)
+            block = file.read(position - start)
+            found = block.rfind(b'\n')
+            if found >= 0:
+                return start + found + 1
+            position = start
+    return 0
+
+def tail_fingerprint(path, offset):
+    """SHA-256 останніх fingerprint_bytes байтів перед позицією offset."""
+    start = max(0, offset - fingerprint_bytes)
+    with open(path, 'rb') as file:
+        file.seek(start)
+        return hashlib.sha256(file.read(offset - start)).hexdigest()
+
+def parse_text_chunks(path, chunk_size=500000, start=0, stop=None):
+    """Розбирає байти [start, stop) текстового файлу частинами і повертає стовпці кешу.
+
+    Рядок заголовка є лише на початку файлу, тому для start > 0 назви
+    стовпців задаються явно.
+    """
+    stop = os.path.getsize(path) if stop is None else stop
+    if stop <= start:
+        return
+    names = ['Date', 'Time'] + measurement_columns
+    dtypes = {name: 'float64' for name in measurement_columns}
+    dtypes.update({'Date': 'str', 'Time': 'str'})
+
+    with io.BufferedReader(_RangeReader(path, start, stop)) as source:
+        reader = pd.read_csv(source, sep=';', na_values=['?'], dtype=dtypes, chunksize=chunk_size,
+                             engine='c', header=0 if start == 0 else None, names=names)
+        for chunk in reader:
+            # Видалення рядків з пропущеними значеннями
+            chunk = chunk[chunk['Global_active_power'].notna()]
+            if chunk.empty:
+                continue
+
+            minutes, _, _ = timestamps.decode_timestamps(chunk['Date'].to_numpy(), chunk['Time'].to_numpy())
+            columns = {'datetime': minutes}
+            for name in measurement_columns:
+                columns[name] = chunk[name].to_numpy(dtype='float64')
+            yield columns
+
+def _collect(chunks):
+    """Об'єднує частини стовпців у суцільні масиви з типами кешу."""
+    parts = {name: [] for name in cache_columns}
+    for columns in chunks:
+        for name in cache_columns:
+            parts[name].append(columns[name])
+    return {name: (np.concatenate(parts[name]) if parts[name] else np.empty(0)).astype(dtype, copy=False)
+            for name, dtype in cache_columns.items()}
+
+def _progress(path, manifest, offset, columns):
+    """Оновлює в маніфесті позицію дочитування, хеш прочитаних байтів, останній час і підпис файлу."""
+    if offset > manifest['byte_offset']:
+        manifest['prefix_sha256'] = extend_hash(path, manifest['prefix_sha256'], manifest['byte_offset'], offset)
+        manifest['segments'].append(offset)
+    manifest['byte_offset'] = offset
+    manifest['fingerprint'] = tail_fingerprint(path, offset)
+    if len(columns['datetime']):
+        manifest['last_minute'] = int(columns['datetime'][-1])
+    return manifest
+
+def build_cache(path, cache_dir=None):
+    """Розбирає текстовий файл і зберігає кожен стовпець в окремий .npy файл."""
+    cache_dir = cache_dir or cache_dir_for(path)
+    os.makedirs(cache_dir, exist_ok=True)
+
+    offset = complete_lines_end(path)
+    columns = _collect(parse_text_chunks(path, stop=offset))
+    for name, values in columns.items():
+        np.save(os.path.join(cache_dir, f'{name}.npy'), values)
+
+    manifest = {
+        'version': cache_version,
+        'build_id': uuid.uuid4().hex,
+        'source': source_signature(path),
+        'rows': len(columns['datetime']),
+        'columns': cache_columns,
+        'last_minute': None,
+        'byte_offset': 0,
+        'segments': [],
+        'prefix_sha256': '',
+    }
+    write_manifest(cache_dir, _progress(path, manifest, offset, columns))
+    return manifest
+
+def _append_npy(path, values):
+    """Дописує значення в кінець .npy файлу і оновлює розмір у заголовку.
+
+    Повертає False, якщо новий заголовок не вміщується на місці старого -
+    тоді файл потрібно записати заново.
+    """
+    with open(path, 'r+b') as file:
+        version = np.lib.format.read_magic(file)
+        if version == (1, 0):
+            shape, fortran_order, dtype = np.lib.format.read_array_header_1_0(file)
+        else:
+            shape, fortran_order, dtype = np.lib.format.read_array_header_2_0(file)
+        header_size = file.tell()
+
+        header = io.BytesIO()
+        np.lib.format.write_array_header_1_0(header, {
+            'descr': np.lib.format.dtype_to_descr(dtype),
+            'fortran_order': fortran_order,
+            'shape': (shape[0] + len(values),),
+        })
+        if len(header.getvalue()) != header_size:
+            return False
+
+        # Спочатку дані, потім заголовок: до оновлення заголовка файл описує старий розмір
+        file.seek(0, os.SEEK_END)
+        file.write(np.ascontiguousarray(values, dtype=dtype).tobytes())
+        file.flush()
+        file.seek(0)
+        file.write(header.getvalue())
+    return True
+
+def append_cache(path, cache_dir=None):
+    """Дочитує лише нові рядки в кінці файлу і дописує їх у кеш.
+
+    Повертає оновлений маніфест або None, якщо кеш потрібно перебудувати
+    (кешу немає, файл не збільшився або змінено будь-які вже прочитані байти).
+    """
+    cache_dir = cache_dir or cache_dir_for(path)
+    manifest = read_manifest(cache_dir)
+    if manifest is None or manifest.get('version') != cache_version:
+        return None
+
+    # Дописування лише збільшує файл; зміна без росту розміру - це редагування на місці
+    offset = manifest['byte_offset']
+    size = os.path.getsize(path)
+    if size <= manifest['source']['size'] or size <= offset:
+        return None
+    if tail_fingerprint(path, offset) != manifest['fingerprint']:
+        return None
+    # Зміни раніше в файлі перевіряються ланцюжком хешів уже прочитаних байтів:
+    # це лише послідовне читання файлу, без повторного розбору рядків
+    if prefix_hash(path, manifest['segments']) != manifest['prefix_sha256']:
+        return None
+
+    end = complete_lines_end(path)
+    columns = _collect(parse_text_chunks(path, start=offset, stop=end))
+    # Рядки, час яких не пізніший за вже прочитані, пропускаються
+    if manifest['last_minute'] is not None:
+        fresh = columns['datetime'] > manifest['last_minute']
+        columns = {name: values[fresh] for name, values in columns.items()}
+
+    if len(columns['datetime']):
+        for name, values in columns.items():
+            file_path = os.path.join(cache_dir, f'{name}.npy')
+            if not _append_npy(file_path, values):
+                np.save(file_path, np.concatenate([np.load(file_path), values]))
+        manifest['rows'] += len(columns['datetime'])
+
+    # Хеш продовжується лише новими байтами, тому час дописування не залежить від розміру історії
+    manifest['source'] = source_signature(path)
+    write_manifest(cache_dir, _progress(path, manifest, end, columns))
+    return manifest
+
+def load_columns(path, cache_dir=None, mmap_mode='r'):
+    """Повертає словник стовпців, відображених у пам'ять.
+
+    Якщо файл було дописано (він збільшився, а байти перед позицією дочитування
+    не змінились), до кешу додаються лише нові рядки; якщо змінено інакше -
+    кеш перебудовується повністю.
+    """
+    cache_dir = cache_dir or cache_dir_for(path)
+    if not is_cache_valid(path, cache_dir):
+        if append_cache(path, cache_dir) is None:
+            build_cache(path, cache_dir)
+
+    return {name: np.load(os.path.join(cache_dir, f'{name}.npy'), mmap_mode=mmap_mode)
+            for name in cache_columns}
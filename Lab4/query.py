@@ -0,0 +1,131 @@
+import numpy as np
+import pandas as pd
+
+# Якщо після умови залишилось менше ніж 1/sparse_ratio рядків, решта умов
+# перевіряється лише для відібраних рядків, а не для всього стовпця
+sparse_ratio = 16
+
+# Оператори порівняння, які підтримують запис результату в готовий буфер (out=...)
+operators = {
+    '>': np.greater,
+    '>=': np.greater_equal,
+    '<': np.less,
+    '<=': np.less_equal,
+    '==': np.equal,
+    '!=': np.not_equal,
+}
+
+class Column:
+    """Посилання на інший стовпець як правий операнд умови."""
+
+    def __init__(self, name):
+        self.name = name
+
+    def __repr__(self):
+        return f"col({self.name!r})"
+
+def col(name):
+    """Повертає посилання на стовпець для порівняння двох стовпців."""
+    return Column(name)
+
+def get_column(data, name, extra=None):
+    """Повертає стовпець як масив NumPy без копіювання, якщо це можливо."""
+    if extra is not None and name in extra:
+        return np.asarray(extra[name])
+    if isinstance(data, pd.DataFrame):
+        return data[name].to_numpy()
+    return data[name]
+
+def row_count(data):
+    """Кількість рядків у DataFrame, структурованому масиві або словнику стовпців."""
+    if isinstance(data, dict):
+        return len(next(iter(data.values()))) if data else 0
+    return len(data)
+
+class Query:
+    """Ланцюжок умов, об'єднаних через AND, у вигляді однієї маски.
+
+    Умови задаються кортежами (стовпець, оператор, значення або col(...)).
+    Кожна умова обчислюється для всього стовпця в один наперед виділений буфер
+    (out=) і додається до маски на місці, тому проміжні маски і відфільтровані
+    копії даних не створюються. Коли рядків залишається мало, решта умов
+    перевіряється лише для їхніх індексів.
+    """
+
+    def __init__(self, *predicates):
+        self.predicates = []
+        for column, op, value in predicates:
+            if op not in operators:
+                raise ValueError(f"Непідтримуваний оператор: {op}")
+            self.predicates.append((column, op, value))
+
+    def where(self, column, op, value):
+        """Повертає новий запит з додатковою умовою."""
+        return Query(*self.predicates, (column, op, value))
+
+    def __repr__(self):
+        conditions = ' & '.join(f"({column} {op} {value!r})" for column, op, value in self.predicates)
+        return f"Query({conditions})"
+
+    def _compile(self, data, extra):
+        compiled = []
+        for column, op, value in self.predicates:
+            left = get_column(data, column, extra)
+            right = get_column(data, value.name, extra) if isinstance(value, Column) else value
+            compiled.append((operators[op], left, right))
+        return compiled
+
+    def _evaluate(self, data, extra):
+        """Булева маска розміром з дані або масив індексів, якщо рядків залишилось мало."""
+        compiled = self._compile(data, extra)
+        rows = row_count(data)
+        mask = np.ones(rows, dtype=bool)
+        buffer = None
+
+        for i, (op, left, right) in enumerate(compiled):
+            if i == 0:
+                op(left, right, out=mask)
+            else:
+                buffer = np.empty(rows, dtype=bool) if buffer is None else buffer
+                op(left, right, out=buffer)
+                mask &= buffer
+            if i + 1 < len(compiled) and np.count_nonzero(mask) * sparse_ratio < rows:
+                return self._refine(np.flatnonzero(mask), compiled[i + 1:])
+        return mask
+
+    @staticmethod
+    def _refine(indices, compiled):
+        """Перевіряє решту умов лише для вибраних рядків."""
+        for op, left, right in compiled:
+            right = right[indices] if isinstance(right, np.ndarray) else right
+            indices = indices[op(left[indices], right)]
+        return indices
+
+    def indices(self, data, extra=None):
+        """Повертає індекси рядків, які задовольняють усі умови."""
+        selected = self._evaluate(data, extra)
+        return np.flatnonzero(selected) if selected.dtype == bool else selected
+
+    def mask(self, data, extra=None):
+        """Повертає булеву маску розміром з дані."""
+        selected = self._evaluate(data, extra)
+        if selected.dtype == bool:
+            return selected
+        result = np.zeros(row_count(data), dtype=bool)
+        result[selected] = True
+        return result
+
+    def count(self, data, extra=None):
+        """Кількість рядків, які задовольняють усі умови."""
+        selected = self._evaluate(data, extra)
+        return int(np.count_nonzero(selected)) if selected.dtype == bool else len(selected)
+
+    def select(self, data, extra=None):
+        """Вибирає рядки, які задовольняють усі умови, одною операцією."""
+        return take_rows(data, self._evaluate(data, extra))
+
+def take_rows(data, indices):
+    """Вибирає рядки за масивом індексів або булевою маскою для DataFrame або структурованого масиву."""
+    if isinstance(data, pd.DataFrame):
+        return data[indices] if indices.dtype == bool else data.take(indices)
+    return data[indices]
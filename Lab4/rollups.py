@@ -0,0 +1,189 @@
+import os
+import json
+import numpy as np
+
+import timestamps
+
+# Рівні агрегації від найдрібнішого до найгрубішого
+levels = ['hour', 'day', 'month']
+statistics = ['sum', 'min', 'max']
+
+def bucket_keys(minutes, level):
+    """Номер інтервалу (години, дня або місяця) для часу у хвилинах."""
+    if level == 'hour':
+        return minutes // 60
+    if level == 'day':
+        return minutes // timestamps.minutes_per_day
+    if level == 'month':
+        return timestamps.month_key(minutes)
+    raise ValueError(f"Невідомий рівень агрегації: {level}")
+
+def bucket_start(keys, level):
+    """Час початку інтервалів (у хвилинах) за їх номерами."""
+    if level == 'hour':
+        return keys * 60
+    if level == 'day':
+        return keys * timestamps.minutes_per_day
+    return timestamps.month_start_minutes(keys)
+
+def _reduce(keys, counts, values):
+    """Згортає відсортовані за ключем рядки: sum/min/max для кожного стовпця.
+
+    values - словник {стовпець: {статистика: масив}}; для сирих даних усі
+    три статистики вказують на ті самі значення.
+    """
+    if len(keys) == 0:
+        empty = {'key': np.empty(0, dtype=np.int64), 'count': np.empty(0, dtype=np.int64)}
+        for name in values:
+            for stat in statistics:
+                empty[f'{name}_{stat}'] = np.empty(0)
+        return empty
+
+    starts = np.concatenate([[0], np.flatnonzero(np.diff(keys)) + 1])
+    cube = {'key': keys[starts], 'count': np.add.reduceat(counts, starts)}
+    for name, stats in values.items():
+        cube[f'{name}_sum'] = np.add.reduceat(stats['sum'], starts)
+        cube[f'{name}_min'] = np.minimum.reduceat(stats['min'], starts)
+        cube[f'{name}_max'] = np.maximum.reduceat(stats['max'], starts)
+    return cube
+
+def _sorted_by_key(keys, arrays):
+    """Впорядковує ключі та масиви, якщо ключі ще не відсортовані."""
+    if len(keys) > 1 and np.any(keys[1:] < keys[:-1]):
+        order = np.argsort(keys, kind='stable')
+        return keys[order], {name: values[order] for name, values in arrays.items()}
+    return keys, arrays
+
+class RollupStore:
+    """Погодинні, денні та місячні агрегати (sum/mean/min/max/count) для стовпців вимірювань.
+
+    Погодинний рівень рахується з хвилинних даних одним проходом reduceat,
+    денний і місячний - з погодинного. Нові хвилини додаються через update,
+    який згортає лише нові дані та об'єднує їх з наявними інтервалами.
+    """
+
+    def __init__(self, columns, cubes=None):
+        self.columns = list(columns)
+        self.cubes = cubes or {}
+
+    @classmethod
+    def build(cls, minutes, data, columns):
+        store = cls(columns)
+        store.cubes = store._build_cubes(np.asarray(minutes, dtype=np.int64), data)
+        return store
+
+    def _build_cubes(self, minutes, data):
+        arrays = {name: np.asarray(data[name], dtype=np.float64) for name in self.columns}
+        keys, arrays = _sorted_by_key(bucket_keys(minutes, 'hour'), arrays)
+        values = {name: {stat: arrays[name] for stat in statistics} for name in self.columns}
+        cubes = {'hour': _reduce(keys, np.ones(len(keys), dtype=np.int64), values)}
+        for level in levels[1:]:
+            cubes[level] = self._coarsen(cubes['hour'], level)
+        return cubes
+
+    def _coarsen(self, cube, level):
+        """Будує грубіший рівень з погодинного."""
+        keys = bucket_keys(cube['key'] * 60, level)
+        values = {name: {stat: cube[f'{name}_{stat}'] for stat in statistics} for name in self.columns}
+        return _reduce(keys, cube['count'], values)
+
+    def _merge(self, old, new):
+        """Об'єднує два куби одного рівня; інтервали з однаковим ключем зливаються."""
+        keys = np.concatenate([old['key'], new['key']])
+        arrays = {name: np.concatenate([old[name], new[name]]) for name in old if name != 'key'}
+        keys, arrays = _sorted_by_key(keys, arrays)
+        values = {name: {stat: arrays[f'{name}_{stat}'] for stat in statistics} for name in self.columns}
+        return _reduce(keys, arrays['count'], values)
+
+    def update(self, minutes, data):
+        """Додає нові хвилинні записи; час роботи пропорційний обсягу нових даних."""
+        fresh = self._build_cubes(np.asarray(minutes, dtype=np.int64), data)
+        if not self.cubes:
+            self.cubes = fresh
+            return self
+        for level in levels:
+            old = self.cubes[level]
+            # Додані дані зазвичай пізніші: зливаються лише останній старий інтервал і нові
+            if len(old['key']) and len(fresh[level]['key']) and fresh[level]['key'][0] >= old['key'][-1]:
+                tail = {name: values[-1:] for name, values in old.items()}
+                merged = self._merge(tail, fresh[level])
+                self.cubes[level] = {name: np.concatenate([values[:-1], merged[name]])
+                                     for name, values in old.items()}
+            else:
+                self.cubes[level] = self._merge(old, fresh[level])
+        return self
+
+    def series(self, level, column, stat='mean'):
+        """Ряд значень статистики по інтервалах рівня: (час початку у хвилинах, значення)."""
+        cube = self.cubes[level]
+        if stat == 'mean':
+            values = cube[f'{column}_sum'] / cube['count']
+        elif stat == 'count':
+            values = cube['count']
+        else:
+            values = cube[f'{column}_{stat}']
+        return bucket_start(cube['key'], level), values
+
+    def choose_level(self, start=None, end=None):
+        """Найгрубіший рівень, межі інтервалів якого збігаються з [start, end)."""
+        for level in reversed(levels):
+            aligned = True
+            for bound in (start, end):
+                if bound is None:
+                    continue
+                key = bucket_keys(np.int64(bound), level)
+                aligned = aligned and bucket_start(np.int64(key), level) == bound
+            if aligned:
+                return level
+        return None
+
+    def aggregate(self, column, stat, start=None, end=None):
+        """Статистика стовпця за період [start, end) (хвилини від 1970-01-01).
+
+        Повертає None, якщо межі періоду не збігаються навіть з годинами -
+        тоді відповідь потрібно рахувати з хвилинних даних.
+        """
+        level = self.choose_level(start, end)
+        if level is None:
+            return None
+        cube = self.cubes[level]
+        lo = 0 if start is None else np.searchsorted(cube['key'], bucket_keys(np.int64(start), level))
+        hi = len(cube['key']) if end is None else np.searchsorted(cube['key'], bucket_keys(np.int64(end), level))
+        part = slice(int(lo), int(max(lo, hi)))
+
+        count = int(cube['count'][part].sum())
+        if stat == 'count':
+            return count
+        if count == 0:
+            return np.nan
+        if stat == 'sum':
+            return float(cube[f'{column}_sum'][part].sum())
+        if stat == 'mean':
+            return float(cube[f'{column}_sum'][part].sum() / count)
+        if stat == 'min':
+            return float(cube[f'{column}_min'][part].min())
+        if stat == 'max':
+            return float(cube[f'{column}_max'][part].max())
+        raise ValueError(f"Невідома статистика: {stat}")
+
+    def save(self, directory, **meta):
+        """Зберігає кожен рівень в окремий .npz файл і метадані у rollups.json."""
+        os.makedirs(directory, exist_ok=True)
+        for level, cube in self.cubes.items():
+            np.savez(os.path.join(directory, f'rollup_{level}.npz'), **cube)
+        with open(os.path.join(directory, 'rollups.json'), 'w', encoding='utf-8') as file:
+            json.dump({'columns': self.columns, **meta}, file, indent=2)
+
+    @classmethod
+    def load(cls, directory):
+        """Читає збережені агрегати та їх метадані (або None, якщо їх немає)."""
+        meta_path = os.path.join(directory, 'rollups.json')
+        if not os.path.exists(meta_path):
+            return None, None
+        with open(meta_path, encoding='utf-8') as file:
+            meta = json.load(file)
+        cubes = {}
+        for level in levels:
+            with np.load(os.path.join(directory, f'rollup_{level}.npz')) as archive:
+                cubes[level] = {name: archive[name] for name in archive.files}
+        return cls(meta['columns'], cubes), meta
@@ -0,0 +1,107 @@
+import numpy as np
+import pandas as pd
+from statistics import NormalDist
+
+# Стовпці груп споживання, для яких завдання 4 рахує середні значення
+meter_columns = ['Sub_metering_1', 'Sub_metering_2', 'Sub_metering_3']
+
+def make_rng(seed=None):
+    """Генератор випадкових чисел; при однаковому seed вибірка відтворюється."""
+    return np.random.default_rng(seed)
+
+def sample_indices(population, size, seed=None):
+    """Індекси вибірки без повторень, відсортовані за зростанням.
+
+    Generator.choice без перемішування для малої частки вибірки використовує
+    алгоритм Флойда, тому не створює перестановку всієї сукупності.
+    """
+    rng = make_rng(seed)
+    if size >= population:
+        return np.arange(population)
+    return np.sort(rng.choice(population, size=size, replace=False, shuffle=False))
+
+class ReservoirSampler:
+    """Резервуарна вибірка (алгоритм R) за один потоковий прохід.
+
+    Зберігаються лише потрібні стовпці; кожна частина даних обробляється
+    векторизовано: рядок з глобальним номером t потрапляє в резервуар з
+    імовірністю size / (t + 1) і замінює випадкову позицію.
+    """
+
+    def __init__(self, size, columns=meter_columns, seed=None):
+        self.size = size
+        self.columns = list(columns)
+        self.rng = make_rng(seed)
+        self.seen = 0
+        self.filled = 0
+        self.reservoir = {name: np.empty(size) for name in self.columns}
+
+    def update(self, batch):
+        """Додає частину даних (DataFrame, структурований масив або словник стовпців)."""
+        values = {name: np.asarray(batch[name], dtype=np.float64) for name in self.columns}
+        rows = len(values[self.columns[0]])
+        offset = 0
+
+        # Спочатку резервуар заповнюється першими рядками потоку
+        if self.filled < self.size:
+            offset = min(self.size - self.filled, rows)
+            for name in self.columns:
+                self.reservoir[name][self.filled:self.filled + offset] = values[name][:offset]
+            self.filled += offset
+            self.seen += offset
+
+        if offset < rows:
+            positions = self.seen + np.arange(rows - offset)
+            accepted = self.rng.random(len(positions)) < self.size / (positions + 1)
+            slots = self.rng.integers(0, self.size, size=int(accepted.sum()))
+            rows_accepted = np.flatnonzero(accepted) + offset
+
+            # Якщо в одну позицію потрапило кілька рядків, залишається останній
+            last_slots, last_index = np.unique(slots[::-1], return_index=True)
+            chosen = rows_accepted[::-1][last_index]
+            for name in self.columns:
+                self.reservoir[name][last_slots] = values[name][chosen]
+            self.seen += len(positions)
+
+        return self
+
+    def sample(self):
+        """Поточна вибірка як словник стовпців."""
+        return {name: values[:self.filled] for name, values in self.reservoir.items()}
+
+def confidence_intervals(sample, population, confidence=0.95):
+    """Середні значення вибірки та довірчі інтервали з поправкою на скінченну сукупність."""
+    z = NormalDist().inv_cdf(0.5 + confidence / 2)
+    intervals = {}
+    for name, values in sample.items():
+        size = len(values)
+        mean = float(np.mean(values)) if size else np.nan
+        if size > 1:
+            correction = np.sqrt(max(population - size, 0) / (population - 1)) if population > 1 else 0.0
+            stderr = float(np.std(values, ddof=1) / np.sqrt(size) * correction)
+        else:
+            stderr = np.nan
+        intervals[name] = {'mean': mean, 'stderr': stderr,
+                           'low': mean - z * stderr, 'high': mean + z * stderr}
+    return intervals
+
+def means_dict(sample):
+    """Середні значення у форматі результатів завдання 4."""
+    return {f'{name}_mean': np.mean(values) for name, values in sample.items()}
+
+def sample_columns(data, size, columns=meter_columns, seed=None):
+    """Вибірка лише потрібних стовпців за індексами, без копіювання цілих записів."""
+    population = len(data)
+    indices = sample_indices(population, size, seed)
+    if isinstance(data, pd.DataFrame):
+        return {name: data[name].to_numpy()[indices] for name in columns}, population
+    return {name: data[name][indices] for name in columns}, population
+
+def stream_file(path, size, columns=meter_columns, seed=None, chunk_size=500000):
+    """Резервуарна вибірка з текстового файлу з читанням лише потрібних стовпців."""
+    sampler = ReservoirSampler(size, columns, seed)
+    reader = pd.read_csv(path, sep=';', usecols=columns, na_values=['?'],
+                         dtype={name: 'float64' for name in columns}, chunksize=chunk_size)
+    for chunk in reader:
+        sampler.update(chunk.dropna())
+    return sampler
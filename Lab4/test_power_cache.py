@@ -0,0 +1,81 @@
+import numpy as np
+
+import generate_data
+import power_cache
+
+def _make_file(tmp_path, rows=20000):
+    path = str(tmp_path / 'power.txt')
+    generate_data.generate_file(path, rows, seed=0, verbose=False)
+    return path
+
+def _full_parse(path):
+    return power_cache._collect(power_cache.parse_text_chunks(path, stop=power_cache.complete_lines_end(path)))
+
+def _same_columns(cached, expected):
+    return all(np.array_equal(cached[name], expected[name], equal_nan=True) for name in power_cache.cache_columns)
+
+def _edit_first_row(path):
+    """Замінює першу цифру Global_active_power у першому рядку даних, не змінюючи розмір файлу."""
+    with open(path, 'r+b') as file:
+        file.readline()
+        row_start = file.tell()
+        row = file.readline()
+        position = row_start + row.index(b';', row.index(b';') + 1) + 1
+        file.seek(position)
+        digit = file.read(1)
+        file.seek(position)
+        file.write(b'1' if digit != b'1' else b'2')
+
+def _split_tail(path, rows):
+    """Відрізає останні rows рядків файлу і повертає їх байти."""
+    with open(path, 'rb') as file:
+        content = file.read()
+    cut = len(content)
+    for _ in range(rows + 1):
+        cut = content.rindex(b'\n', 0, cut)
+    cut += 1
+    with open(path, 'wb') as file:
+        file.write(content[:cut])
+    return content[cut:]
+
+def test_in_place_edit_rebuilds_cache(tmp_path):
+    path = _make_file(tmp_path)
+    power_cache.load_columns(path)
+    build_id = power_cache.read_manifest(power_cache.cache_dir_for(path))['build_id']
+
+    _edit_first_row(path)
+    cached = power_cache.load_columns(path, mmap_mode=None)
+
+    assert _same_columns(cached, _full_parse(path))
+    assert power_cache.read_manifest(power_cache.cache_dir_for(path))['build_id'] != build_id
+
+def test_append_extends_cache(tmp_path):
+    path = _make_file(tmp_path)
+    tail = _split_tail(path, 100)
+    power_cache.load_columns(path)
+    build_id = power_cache.read_manifest(power_cache.cache_dir_for(path))['build_id']
+
+    # Спочатку дописується неповний рядок, потім його кінець
+    with open(path, 'ab') as file:
+        file.write(tail[:-10])
+    power_cache.load_columns(path)
+    with open(path, 'ab') as file:
+        file.write(tail[-10:])
+    cached = power_cache.load_columns(path, mmap_mode=None)
+
+    assert _same_columns(cached, _full_parse(path))
+    assert power_cache.read_manifest(power_cache.cache_dir_for(path))['build_id'] == build_id
+
+def test_edit_before_append_rebuilds_cache(tmp_path):
+    path = _make_file(tmp_path)
+    tail = _split_tail(path, 100)
+    power_cache.load_columns(path)
+    build_id = power_cache.read_manifest(power_cache.cache_dir_for(path))['build_id']
+
+    _edit_first_row(path)
+    with open(path, 'ab') as file:
+        file.write(tail)
+    cached = power_cache.load_columns(path, mmap_mode=None)
+
+    assert _same_columns(cached, _full_parse(path))
+    assert power_cache.read_manifest(power_cache.cache_dir_for(path))['build_id'] != build_id
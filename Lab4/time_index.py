@@ -0,0 +1,137 @@
+import numpy as np
+
+import timestamps
+
+def to_minutes(value):
+    """Перетворює дату/час (рядок ISO, datetime, datetime64 або число) на хвилини від 1970-01-01."""
+    if isinstance(value, (int, np.integer)):
+        return int(value)
+    return int(np.datetime64(value, 'm').astype(np.int64))
+
+def concat_ranges(starts, stops):
+    """Об'єднує діапазони [start, stop) в один масив індексів без циклу Python."""
+    lengths = np.maximum(stops - starts, 0)
+    total = int(lengths.sum())
+    if total == 0:
+        return np.empty(0, dtype=np.int64)
+    nonempty = lengths > 0
+    starts, lengths = starts[nonempty], lengths[nonempty]
+    # Кожен елемент - це start його діапазону плюс зсув усередині діапазону
+    ends = np.cumsum(lengths)
+    offsets = np.arange(total) - np.repeat(ends - lengths, lengths)
+    return np.repeat(starts, lengths) + offsets
+
+class TimeIndex:
+    """Індекс за часом: відсортовані мітки часу та таблиці зсувів для днів і годин.
+
+    Вибірки за діапазоном дат і за годинами доби виконуються через
+    searchsorted і зрізи (O(log n) на межу) замість повного перегляду рядків.
+    Повернуті індекси відповідають рядкам вихідних даних.
+    """
+
+    def __init__(self, minutes):
+        minutes = np.asarray(minutes, dtype=np.int64)
+        # Дані UCI впорядковані за часом; інакше зберігається перестановка
+        if len(minutes) > 1 and np.any(minutes[1:] < minutes[:-1]):
+            self.order = np.argsort(minutes, kind='stable')
+            self.minutes = minutes[self.order]
+        else:
+            self.order = None
+            self.minutes = minutes
+        self._build_tables()
+
+    def _build_tables(self):
+        minutes = self.minutes
+        if len(minutes) == 0:
+            self.days = np.empty(0, dtype=np.int64)
+            self.day_offsets = np.zeros(1, dtype=np.int64)
+            self.hour_offsets = np.zeros((0, 25), dtype=np.int64)
+            return
+
+        # Таблиця днів: номер дня і позиція першого рядка цього дня
+        first_day = minutes[0] // timestamps.minutes_per_day
+        last_day = minutes[-1] // timestamps.minutes_per_day
+        self.days = np.arange(first_day, last_day + 1, dtype=np.int64)
+        self.day_offsets = np.searchsorted(minutes, np.append(self.days, last_day + 1) * timestamps.minutes_per_day)
+
+        # Таблиця годин: для кожного дня позиції початку кожної з 24 годин (і кінця доби)
+        hour_starts = self.days[:, None] * timestamps.minutes_per_day + np.arange(25) * 60
+        self.hour_offsets = np.searchsorted(minutes, hour_starts.ravel()).reshape(len(self.days), 25)
+
+    def extend(self, minutes):
+        """Додає нові мітки часу; таблиці перераховуються лише для нових днів."""
+        minutes = np.asarray(minutes, dtype=np.int64)
+        if len(minutes) == 0:
+            return self
+        in_order = np.all(minutes[1:] >= minutes[:-1])
+        if self.order is not None or not in_order or (len(self.minutes) and minutes[0] < self.minutes[-1]):
+            # Дані не у хронологічному порядку - індекс будується заново
+            original = np.empty_like(self.minutes)
+            if self.order is not None:
+                original[self.order] = self.minutes
+            else:
+                original = self.minutes
+            self.__init__(np.concatenate([original, minutes]))
+            return self
+
+        kept = max(len(self.days) - 1, 0)
+        first_day = self.days[-1] if len(self.days) else minutes[0] // timestamps.minutes_per_day
+        self.minutes = np.concatenate([self.minutes, minutes])
+        last_day = self.minutes[-1] // timestamps.minutes_per_day
+
+        # Останній наявний день міг бути неповним, тому перераховується разом з новими
+        new_days = np.arange(first_day, last_day + 1, dtype=np.int64)
+        day_bounds = np.append(new_days, last_day + 1) * timestamps.minutes_per_day
+        hour_starts = new_days[:, None] * timestamps.minutes_per_day + np.arange(25) * 60
+        self.days = np.concatenate([self.days[:kept], new_days])
+        self.day_offsets = np.concatenate([self.day_offsets[:kept], np.searchsorted(self.minutes, day_bounds)])
+        self.hour_offsets = np.concatenate([self.hour_offsets[:kept],
+                                            np.searchsorted(self.minutes, hour_starts.ravel()).reshape(-1, 25)])
+        return self
+
+    def __len__(self):
+        return len(self.minutes)
+
+    def _rows(self, positions):
+        """Переводить позиції у відсортованому індексі в номери рядків даних."""
+        if self.order is None:
+            return positions
+        return np.sort(self.order[positions])
+
+    def range_slice(self, start=None, end=None):
+        """Зріз відсортованих позицій для часу в межах [start, end)."""
+        lo = 0 if start is None else np.searchsorted(self.minutes, to_minutes(start), 'left')
+        hi = len(self.minutes) if end is None else np.searchsorted(self.minutes, to_minutes(end), 'left')
+        return slice(int(lo), int(max(lo, hi)))
+
+    def date_range(self, start=None, end=None):
+        """Номери рядків з часом у межах [start, end)."""
+        part = self.range_slice(start, end)
+        if self.order is None:
+            return np.arange(part.start, part.stop)
+        return self._rows(np.arange(part.start, part.stop))
+
+    def day_slice(self, day):
+        """Зріз позицій для одного дня (рядок дати або номер дня від 1970-01-01)."""
+        day = day if isinstance(day, (int, np.integer)) else to_minutes(day) // timestamps.minutes_per_day
+        i = int(day - self.days[0]) if len(self.days) else -1
+        if i < 0 or i >= len(self.days):
+            return slice(0, 0)
+        return slice(int(self.day_offsets[i]), int(self.day_offsets[i + 1]))
+
+    def hour_range(self, hour_from, hour_to=24, start=None, end=None):
+        """Номери рядків, час яких у межах годин [hour_from, hour_to) кожного дня.
+
+        Можна додатково обмежити діапазон дат [start, end).
+        """
+        starts = self.hour_offsets[:, hour_from]
+        stops = self.hour_offsets[:, hour_to]
+        if start is not None or end is not None:
+            part = self.range_slice(start, end)
+            starts = np.clip(starts, part.start, part.stop)
+            stops = np.clip(stops, part.start, part.stop)
+        return self._rows(concat_ranges(starts, stops))
+
+    def counts_per_day(self):
+        """Кількість рядків у кожному дні (разом з масивом днів)."""
+        return self.days, np.diff(self.day_offsets)
@@ -0,0 +1,126 @@
+import numpy as np
+
+# Хвилин у добі та зсув дня тижня: 1970-01-01 був четвергом (понеділок = 0)
+minutes_per_day = 24 * 60
+epoch_weekday = 3
+
+def _as_code_matrix(values, width):
+    """Подає масив рядків як матрицю кодів символів розміром (n, width)."""
+    values = np.asarray(values)
+    if values.dtype.kind == 'O':
+        values = values.astype(f'U{width}')
+    # Поле структурованого масиву не є суцільним у пам'яті - його потрібно скопіювати
+    if values.dtype.kind == 'U':
+        values = np.ascontiguousarray(values.astype(f'U{width}', copy=False))
+        return values.view(np.uint32).reshape(len(values), width)
+    values = np.ascontiguousarray(values.astype(f'S{width}', copy=False))
+    return values.view(np.uint8).reshape(len(values), width)
+
+def _parse_fields(matrix, separator, field_count):
+    """Розбирає числові поля, розділені символом separator, без циклу по рядках.
+
+    Поля можуть мати різну ширину (наприклад, "1/1/2007" та "16/12/2006"),
+    тому межі полів визначаються за позиціями роздільників, а значення
+    накопичується за схемою Горнера по позиціях усередині поля.
+    """
+    rows, width = matrix.shape
+    if rows == 0:
+        return np.zeros((0, field_count), dtype=np.int64)
+
+    # Позиції роздільників (у кожному рядку їх рівно field_count - 1)
+    _, separator_columns = np.nonzero(matrix == ord(separator))
+    separators = separator_columns.reshape(rows, field_count - 1)
+    # Кінець рядка - позиція першого нульового символу доповнення
+    length = width - np.argmax(matrix[:, ::-1] != 0, axis=1)
+    bounds = np.column_stack([np.full(rows, -1), separators, length])
+
+    # Вибірка символів з плоского масиву за зсувом початку рядка
+    flat = matrix.ravel()
+    row_start = np.arange(rows, dtype=np.int64) * width
+
+    fields = np.zeros((rows, field_count), dtype=np.int64)
+    for index in range(field_count):
+        start = row_start + bounds[:, index] + 1
+        field_width = bounds[:, index + 1] - bounds[:, index] - 1
+        value = np.zeros(rows, dtype=np.int32)
+        for offset in range(int(field_width.max())):
+            digit = flat.take(np.minimum(start + offset, flat.size - 1)).astype(np.int32) - ord('0')
+            value = np.where(offset < field_width, value * 10 + digit, value)
+        fields[:, index] = value
+
+    return fields
+
+def _fixed_width_minutes(matrix):
+    """Швидкий шлях для часу у форматі "ГГ:ХХ:СС" з провідними нулями."""
+    if not (np.all(matrix[:, 2] == ord(':')) and np.all(matrix[:, 5] == ord(':'))):
+        return None
+    digit = lambda column: matrix[:, column].astype(np.int64) - ord('0')
+    return (digit(0) * 10 + digit(1)) * 60 + digit(3) * 10 + digit(4)
+
+def days_from_civil(year, month, day):
+    """Кількість днів від 1970-01-01 для григоріанської дати (векторизовано)."""
+    year = year - (month <= 2)
+    era = year // 400
+    year_of_era = year - era * 400
+    day_of_year = (153 * (month + np.where(month > 2, -3, 9)) + 2) // 5 + day - 1
+    day_of_era = year_of_era * 365 + year_of_era // 4 - year_of_era // 100 + day_of_year
+    return era * 146097 + day_of_era - 719468
+
+def civil_from_days(days):
+    """Перетворює кількість днів від 1970-01-01 на (рік, місяць, день), векторизовано."""
+    days = days + 719468
+    era = days // 146097
+    day_of_era = days - era * 146097
+    year_of_era = (day_of_era - day_of_era // 1460 + day_of_era // 36524 - day_of_era // 146096) // 365
+    day_of_year = day_of_era - (365 * year_of_era + year_of_era // 4 - year_of_era // 100)
+    month_index = (5 * day_of_year + 2) // 153
+    day = day_of_year - (153 * month_index + 2) // 5 + 1
+    month = np.where(month_index < 10, month_index + 3, month_index - 9)
+    year = year_of_era + era * 400 + (month <= 2)
+    return year, month, day
+
+def decode_dates(dates):
+    """Перетворює рядки "д/м/рррр" на кількість днів від 1970-01-01."""
+    fields = _parse_fields(_as_code_matrix(dates, 10), '/', 3)
+    return days_from_civil(fields[:, 2], fields[:, 1], fields[:, 0])
+
+def decode_time_minutes(times):
+    """Перетворює рядки "ГГ:ХХ:СС" на хвилину доби."""
+    matrix = _as_code_matrix(times, 8)
+    minutes = _fixed_width_minutes(matrix)
+    if minutes is None:
+        fields = _parse_fields(matrix, ':', 3)
+        minutes = fields[:, 0] * 60 + fields[:, 1]
+    return minutes
+
+def decode_hours(times):
+    """Повертає годину з рядків "ГГ:ХХ:СС" як масив uint8."""
+    matrix = _as_code_matrix(times, 8)
+    first = matrix[:, 0].astype(np.int16) - ord('0')
+    second = matrix[:, 1].astype(np.int16) - ord('0')
+    # Підтримка годин без провідного нуля ("7:05:00")
+    hours = np.where(matrix[:, 1] == ord(':'), first, first * 10 + second)
+    return hours.astype(np.uint8)
+
+def hour_of(minutes):
+    """Година доби для часу у хвилинах від 1970-01-01."""
+    return ((minutes // 60) % 24).astype(np.uint8)
+
+def weekday_of(minutes):
+    """День тижня (понеділок = 0) для часу у хвилинах від 1970-01-01."""
+    return ((minutes // minutes_per_day + epoch_weekday) % 7).astype(np.uint8)
+
+def decode_timestamps(dates, times):
+    """Перетворює стовпці Date/Time на хвилини від 1970-01-01, годину та день тижня."""
+    minutes = decode_dates(dates) * minutes_per_day + decode_time_minutes(times)
+    return minutes, hour_of(minutes), weekday_of(minutes)
+
+def month_key(minutes):
+    """Номер місяця (рік * 12 + місяць - 1) для часу у хвилинах від 1970-01-01."""
+    year, month, _ = civil_from_days(minutes // minutes_per_day)
+    return year * 12 + month - 1
+
+def month_start_minutes(keys):
+    """Час початку місяця (у хвилинах) за номером місяця з month_key."""
+    keys = np.asarray(keys, dtype=np.int64)
+    return days_from_civil(keys // 12, keys % 12 + 1, np.ones_like(keys)) * minutes_per_day